@@ -1,15 +1,15 @@
-from .base_agent import BaseAgent, AgentStatus, AgentResult
-from .data_fetcher import DataFetcherAgent
-from .analyzer import AnalyzerAgent
-from .visualizer import VisualizerAgent
-from .summarizer import SummarizerAgent
-
-__all__ = [
-    'BaseAgent',
-    'AgentStatus', 
-    'AgentResult',
-    'DataFetcherAgent',
-    'AnalyzerAgent',
-    'VisualizerAgent',
-    'SummarizerAgent'
-]
+from .base_agent import BaseAgent, AgentStatus, AgentResult
+from .data_fetcher import DataFetcherAgent
+from .analyzer import AnalyzerAgent
+from .visualizer import VisualizerAgent
+from .summarizer import SummarizerAgent
+
+__all__ = [
+    'BaseAgent',
+    'AgentStatus', 
+    'AgentResult',
+    'DataFetcherAgent',
+    'AnalyzerAgent',
+    'VisualizerAgent',
+    'SummarizerAgent'
+]
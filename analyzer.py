@@ -1,287 +1,481 @@
-import pandas as pd
-import numpy as np
-from typing import Dict, Any, List, Optional
-from .base_agent import BaseAgent, AgentStatus, AgentResult
-import logging
-
-class AnalyzerAgent(BaseAgent):
-    def __init__(self):
-        super().__init__(
-            agent_id="analyzer",
-            role="Financial Analyzer",
-            description="Analyzes financial data and identifies trends, patterns, and insights"
-        )
-        
-    def can_handle(self, task: str) -> bool:
-        """Check if task involves analysis"""
-        keywords = ["analyze", "analysis", "trend", "pattern", "insight", "calculate", "compare", "performance"]
-        return any(keyword in task.lower() for keyword in keywords)
-        
-    def get_capabilities(self) -> List[str]:
-        return [
-            "Calculate financial metrics",
-            "Identify trends and patterns",
-            "Compare performance across periods",
-            "Generate statistical insights",
-            "Analyze volatility and risk"
-        ]
-        
-    async def execute(self, task: str, context: Dict[str, Any] = None) -> AgentResult:
-        """Analyze financial data and extract insights"""
-        try:
-            self.update_status(AgentStatus.WORKING)
-            financial_data = self.get_from_context("financial_data")
-            if not financial_data and context:
-                financial_data = context.get("financial_data")
-            
-            if not financial_data:
-                raise ValueError("No financial data available for analysis")
- 
-            df = pd.DataFrame(financial_data["raw_data"])
-            if df.empty:
-                raise ValueError("No data available for analysis")
-
-            if 'Date' in df.columns:
-                df['Date'] = pd.to_datetime(df['Date'])
-                df = df.sort_values('Date')
-       
-            analysis_results = {}
-            
-            if "trend" in task.lower():
-                analysis_results.update(self._analyze_trends(df))
-            
-            if "quarter" in task.lower():
-                analysis_results.update(self._analyze_quarters(df))
-            
-            if "performance" in task.lower() or "profit" in task.lower():
-                analysis_results.update(self._analyze_performance(df))
-            
-            if "segment" in task.lower():
-                analysis_results.update(self._analyze_segments(df))
-            
-            if "country" in task.lower():
-                analysis_results.update(self._analyze_countries(df))
-            
-            if "product" in task.lower():
-                analysis_results.update(self._analyze_products(df))
-            
-  
-            analysis_results.update(self._calculate_basic_metrics(df))
-            
-      
-            self.add_to_context("analysis_results", analysis_results)
-            
-            self.update_status(AgentStatus.COMPLETED)
-            self.store_result(analysis_results)
-            
-            return AgentResult(
-                agent_id=self.agent_id,
-                status=AgentStatus.COMPLETED,
-                data=analysis_results,
-                metadata={"metrics_calculated": len(analysis_results)}
-            )
-            
-        except Exception as e:
-            self.logger.error(f"Error in analysis: {str(e)}")
-            self.update_status(AgentStatus.ERROR)
-            return AgentResult(
-                agent_id=self.agent_id,
-                status=AgentStatus.ERROR,
-                data=None,
-                error=str(e)
-            )
-    
-    def _analyze_trends(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze profit and sales trends"""
-        if 'Profit' not in df.columns:
-            return {}
-        
-     
-        if 'Date' in df.columns:
-            daily_profit = df.groupby('Date')['Profit'].sum().sort_index()
-            
-         
-            if len(daily_profit) >= 2:
-                recent_trend = "upward" if daily_profit.iloc[-1] > daily_profit.iloc[0] else "downward"
-                profit_change = ((daily_profit.iloc[-1] - daily_profit.iloc[0]) / abs(daily_profit.iloc[0])) * 100 if daily_profit.iloc[0] != 0 else 0
-            else:
-                recent_trend = "stable"
-                profit_change = 0
-        else:
-           
-            profit_values = df['Profit'].values
-            if len(profit_values) >= 2:
-               
-                recent_trend = "upward" if profit_values[-1] > profit_values[0] else "downward"
-                profit_change = ((profit_values[-1] - profit_values[0]) / abs(profit_values[0])) * 100 if profit_values[0] != 0 else 0
-            else:
-                recent_trend = "stable"
-                profit_change = 0
-        
-        return {
-            "trend_direction": recent_trend,
-            "profit_change_percent": round(profit_change, 2),
-            "total_profit": df['Profit'].sum(),
-            "avg_daily_profit": df['Profit'].mean()
-        }
-    
-    def _analyze_quarters(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze quarterly performance"""
-        if 'Date' not in df.columns or 'Profit' not in df.columns:
-            return {}
-        
-      
-        df_with_date = df.copy()
-        df_with_date['Date'] = pd.to_datetime(df_with_date['Date'])
-        df_with_date.set_index('Date', inplace=True)
-        
-       
-        quarterly_data = df_with_date.resample('Q').agg({
-            'Profit': 'sum',
-            'Gross Sales': 'sum',
-            'Units Sold': 'sum',
-            'COGS': 'sum'
-        }).dropna()
-        
-        if len(quarterly_data) < 2:
-            return {"quarterly_analysis": "Insufficient data for quarterly analysis"}
-        
-      
-        quarterly_profit_changes = quarterly_data['Profit'].pct_change().dropna() * 100
-        
-      
-        last_quarters = quarterly_profit_changes.tail(3)
-        
-        return {
-            "quarterly_profit": quarterly_data['Profit'].to_dict(),
-            "quarterly_profit_changes": quarterly_profit_changes.to_dict(),
-            "last_3_quarters_avg_change": round(last_quarters.mean(), 2),
-            "quarterly_volatility": round(quarterly_profit_changes.std(), 2),
-            "best_quarter": round(quarterly_profit_changes.max(), 2),
-            "worst_quarter": round(quarterly_profit_changes.min(), 2)
-        }
-    
-    def _analyze_performance(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze overall performance metrics"""
-        if 'Profit' not in df.columns:
-            return {}
-        
-       
-        total_profit = df['Profit'].sum()
-        avg_profit = df['Profit'].mean()
-        profit_std = df['Profit'].std()
-        
-      
-        profit_margin = 0
-        if 'Gross Sales' in df.columns and df['Gross Sales'].sum() > 0:
-            profit_margin = (total_profit / df['Gross Sales'].sum()) * 100
-        
-       
-        efficiency_metrics = {}
-        if 'Units Sold' in df.columns and 'Units Sold' in df.columns:
-            efficiency_metrics['profit_per_unit'] = total_profit / df['Units Sold'].sum() if df['Units Sold'].sum() > 0 else 0
-        
-        return {
-            "total_profit": round(total_profit, 2),
-            "avg_profit": round(avg_profit, 2),
-            "profit_std": round(profit_std, 2),
-            "profit_margin_percent": round(profit_margin, 2),
-            **efficiency_metrics
-        }
-    
-    def _analyze_segments(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze performance by segment"""
-        if 'Segment' not in df.columns or 'Profit' not in df.columns:
-            return {}
-        
-        segment_analysis = df.groupby('Segment').agg({
-            'Profit': ['sum', 'mean', 'count'],
-            'Gross Sales': 'sum',
-            'Units Sold': 'sum'
-        }).round(2)
-        
-       
-        segment_analysis['Profit_Margin'] = (segment_analysis[('Profit', 'sum')] / segment_analysis[('Gross Sales', 'sum')] * 100).round(2)
-        
-        return {
-            "segment_performance": segment_analysis.to_dict(),
-            "best_segment": segment_analysis[('Profit', 'sum')].idxmax(),
-            "worst_segment": segment_analysis[('Profit', 'sum')].idxmin()
-        }
-    
-    def _analyze_countries(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze performance by country"""
-        if 'Country' not in df.columns or 'Profit' not in df.columns:
-            return {}
-        
-        country_analysis = df.groupby('Country').agg({
-            'Profit': ['sum', 'mean', 'count'],
-            'Gross Sales': 'sum',
-            'Units Sold': 'sum'
-        }).round(2)
-        
-      
-        country_analysis['Profit_Margin'] = (country_analysis[('Profit', 'sum')] / country_analysis[('Gross Sales', 'sum')] * 100).round(2)
-        
-        return {
-            "country_performance": country_analysis.to_dict(),
-            "best_country": country_analysis[('Profit', 'sum')].idxmax(),
-            "worst_country": country_analysis[('Profit', 'sum')].idxmin()
-        }
-    
-    def _analyze_products(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze performance by product"""
-        if 'Product' not in df.columns or 'Profit' not in df.columns:
-            return {}
-        
-        product_analysis = df.groupby('Product').agg({
-            'Profit': ['sum', 'mean', 'count'],
-            'Gross Sales': 'sum',
-            'Units Sold': 'sum'
-        }).round(2)
-        
-     
-        product_analysis['Profit_Margin'] = (product_analysis[('Profit', 'sum')] / product_analysis[('Gross Sales', 'sum')] * 100).round(2)
-        
-        return {
-            "product_performance": product_analysis.to_dict(),
-            "best_product": product_analysis[('Profit', 'sum')].idxmax(),
-            "worst_product": product_analysis[('Profit', 'sum')].idxmin()
-        }
-    
-    def _calculate_basic_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Calculate basic financial metrics"""
-        metrics = {}
-        
-        if 'Profit' in df.columns:
-            profit = df['Profit']
-            metrics.update({
-                "total_profit": round(profit.sum(), 2),
-                "max_profit": round(profit.max(), 2),
-                "min_profit": round(profit.min(), 2),
-                "avg_profit": round(profit.mean(), 2)
-            })
-        
-        if 'Gross Sales' in df.columns:
-            sales = df['Gross Sales']
-            metrics.update({
-                "total_sales": round(sales.sum(), 2),
-                "avg_sales": round(sales.mean(), 2)
-            })
-        
-        if 'Units Sold' in df.columns:
-            units = df['Units Sold']
-            metrics.update({
-                "total_units": round(units.sum(), 0),
-                "avg_units": round(units.mean(), 2)
-            })
-        
-        if 'COGS' in df.columns:
-            cogs = df['COGS']
-            metrics.update({
-                "total_cogs": round(cogs.sum(), 2),
-                "avg_cogs": round(cogs.mean(), 2)
-            })
-        
-        return metrics
-    
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from .base_agent import BaseAgent, AgentStatus, AgentResult
+import logging
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+BASIC_METRIC_COLUMNS = ('Profit', 'Gross Sales', 'Units Sold', 'COGS')
+CATEGORY_COLUMNS = ('Segment', 'Country', 'Product')
+QUARTERLY_COLUMNS = ('Profit', 'Gross Sales', 'Units Sold', 'COGS')
+
+# Value columns stored at reduced width; reported totals are accumulated in float64
+FLOAT_DOWNCAST_COLUMNS = ('Profit', 'Gross Sales', 'COGS')
+INTEGER_DOWNCAST_COLUMNS = ('Units Sold',)
+
+# Task keywords and the analysis each one triggers, in execution order
+ANALYSIS_TRIGGERS = (
+    ("trend", "_analyze_trends"),
+    ("quarter", "_analyze_quarters"),
+    ("performance", "_analyze_performance"),
+    ("profit", "_analyze_performance"),
+    ("segment", "_analyze_segments"),
+    ("country", "_analyze_countries"),
+    ("product", "_analyze_products"),
+)
+TRIGGER_PATTERN = re.compile("|".join(re.escape(keyword) for keyword, _ in ANALYSIS_TRIGGERS))
+
+CAN_HANDLE_KEYWORDS = frozenset({"analyze", "analysis", "trend", "pattern", "insight", "calculate", "compare", "performance"})
+CAN_HANDLE_PATTERN = re.compile("|".join(sorted(CAN_HANDLE_KEYWORDS)))
+ROLE = "Financial Analyzer"
+DESCRIPTION = "Analyzes financial data and identifies trends, patterns, and insights"
+CAPABILITIES = (
+    "Calculate financial metrics",
+    "Identify trends and patterns",
+    "Compare performance across periods",
+    "Generate statistical insights",
+    "Analyze volatility and risk",
+)
+
+# Shared across requests so analysis threads are reused rather than respawned
+ANALYSIS_EXECUTOR = ThreadPoolExecutor(max_workers=min(6, os.cpu_count() or 1), thread_name_prefix="analyzer")
+
+# Parsed frames kept per agent for re-analysis of the same raw_data payload
+DF_CACHE_SIZE = 4
+
+# Analysis results memoized by (analyses run, data content hash) across agents
+ANALYSIS_RESULT_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+RESULT_CACHE_SIZE = 8
+RESULT_CACHE_MAX_CELLS = 10_000_000
+
+# Below this size pandas' groupby is already cheap; above it the fused kernel wins
+GROUP_KERNEL_MIN_ROWS = 50_000
+
+def _sum64(values: Any) -> float:
+    """Sum in float64 regardless of the storage dtype, skipping NaN like pandas"""
+    return float(np.nansum(np.asarray(values), dtype=np.float64))
+
+def _finalize(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Round scalar metrics for reporting in one pass at the serialization boundary"""
+    return {
+        key: round(value, 2) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+        for key, value in results.items()
+    }
+
+def _group_agg5(codes: np.ndarray, profit: np.ndarray, gsales: np.ndarray,
+                units: np.ndarray, nkeys: int) -> Dict[str, np.ndarray]:
+    """Fused per-group sum/mean/count over integer group codes.
+    
+    NaN values are skipped the same way pandas' sum/count skip them.
+    """
+    valid = codes >= 0
+    codes = codes[valid]
+    profit = profit[valid].astype('float64')
+    has_profit = ~np.isnan(profit)
+    
+    profit_sum = np.bincount(codes, weights=np.where(has_profit, profit, 0.0), minlength=nkeys)
+    profit_count = np.bincount(codes[has_profit], minlength=nkeys)
+    gross_sales = np.bincount(codes, weights=np.nan_to_num(gsales[valid].astype('float64')), minlength=nkeys)
+    units_sold = np.bincount(codes, weights=np.nan_to_num(units[valid].astype('float64')), minlength=nkeys)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_mean = profit_sum / profit_count
+    
+    return {
+        "profit_sum": profit_sum,
+        "profit_mean": profit_mean,
+        "profit_count": profit_count,
+        "gross_sales": gross_sales,
+        "units_sold": units_sold
+    }
+
+class AnalyzerAgent(BaseAgent):
+    def __init__(self):
+        super().__init__(
+            agent_id="analyzer",
+            role=ROLE,
+            description=DESCRIPTION
+        )
+        self._df_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        
+    def can_handle(self, task: str) -> bool:
+        """Check if task involves analysis"""
+        return CAN_HANDLE_PATTERN.search(task.lower()) is not None
+        
+    def get_capabilities(self) -> List[str]:
+        return list(CAPABILITIES)
+        
+    async def execute(self, task: str, context: Dict[str, Any] = None) -> AgentResult:
+        """Analyze financial data and extract insights"""
+        try:
+            self.update_status(AgentStatus.WORKING)
+            financial_data = self.get_from_context("financial_data")
+            if not financial_data and context:
+                financial_data = context.get("financial_data")
+            
+            if not financial_data:
+                raise ValueError("No financial data available for analysis")
+ 
+            df = self._get_dataframe(financial_data)
+            if df.empty:
+                raise ValueError("No data available for analysis")
+       
+            method_names = self._match_analyses(task.lower())
+            cache_key = self._result_cache_key(df, method_names)
+            
+            if cache_key is not None and cache_key in ANALYSIS_RESULT_CACHE:
+                ANALYSIS_RESULT_CACHE.move_to_end(cache_key)
+                analysis_results = dict(ANALYSIS_RESULT_CACHE[cache_key])
+            else:
+                analysis_results = {}
+                basic_metrics = self._calculate_basic_metrics(df)
+                
+                # The analyses are independent reads of df, so run them off the event loop
+                loop = asyncio.get_running_loop()
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(ANALYSIS_EXECUTOR, analyze, df)
+                    for analyze in self._select_analyses(method_names, basic_metrics)
+                ))
+                for result in results:
+                    analysis_results.update(result)
+                
+      
+                analysis_results.update(basic_metrics)
+                analysis_results = _finalize(analysis_results)
+                
+                if cache_key is not None:
+                    ANALYSIS_RESULT_CACHE[cache_key] = dict(analysis_results)
+                    if len(ANALYSIS_RESULT_CACHE) > RESULT_CACHE_SIZE:
+                        ANALYSIS_RESULT_CACHE.popitem(last=False)
+            
+      
+            self.add_to_context("analysis_results", analysis_results)
+            
+            self.update_status(AgentStatus.COMPLETED)
+            self.store_result(analysis_results)
+            
+            return AgentResult(
+                agent_id=self.agent_id,
+                status=AgentStatus.COMPLETED,
+                data=analysis_results,
+                metadata={"metrics_calculated": len(analysis_results)}
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Error in analysis: {str(e)}")
+            self.update_status(AgentStatus.ERROR)
+            return AgentResult(
+                agent_id=self.agent_id,
+                status=AgentStatus.ERROR,
+                data=None,
+                error=str(e)
+            )
+    
+    def _match_analyses(self, task_lower: str) -> Tuple[str, ...]:
+        """Resolve the analysis methods triggered by the task in a single scan"""
+        matched = set(TRIGGER_PATTERN.findall(task_lower))
+        return tuple(dict.fromkeys(name for keyword, name in ANALYSIS_TRIGGERS if keyword in matched))
+    
+    def _select_analyses(self, method_names: Tuple[str, ...], basic_metrics: Dict[str, Any]) -> List[Callable[[pd.DataFrame], Dict[str, Any]]]:
+        """Bind the matched analysis methods, ready to be called with the frame"""
+        analyses = []
+        for name in method_names:
+            if name == "_analyze_trends":
+                analyses.append(partial(self._analyze_trends, basic_metrics=basic_metrics))
+            else:
+                analyses.append(getattr(self, name))
+        return analyses
+    
+    def _result_cache_key(self, df: pd.DataFrame, method_names: Tuple[str, ...]) -> Optional[tuple]:
+        """Content key for memoized results, or None when the frame is too large to cache"""
+        if df.size > RESULT_CACHE_MAX_CELLS:
+            return None
+        data_hash = hash(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return (method_names, data_hash)
+    
+    def _get_dataframe(self, financial_data: Dict[str, Any]) -> pd.DataFrame:
+        """Return the parsed frame for raw_data, reusing it when the same payload is analyzed again"""
+        raw = financial_data["raw_data"]
+        key = (id(raw), len(raw))
+        
+        cached = self._df_cache.get(key)
+        # The identity check guards against a recycled id() of a freed payload
+        if cached is not None and cached[0] is raw:
+            self._df_cache.move_to_end(key)
+            return cached[1]
+        
+        df = self._build_df(raw, financial_data.get("columns"))
+        self._df_cache[key] = (raw, df)
+        if len(self._df_cache) > DF_CACHE_SIZE:
+            self._df_cache.popitem(last=False)
+        return df
+    
+    def _build_df(self, raw: Any, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Build the analysis frame from row records or a column mapping"""
+        if isinstance(raw, dict):
+            df = pd.DataFrame(raw, copy=False)
+        else:
+            df = pd.DataFrame.from_records(raw, columns=columns)
+        
+        # Narrower numeric columns halve the bytes read by every analysis pass
+        for col in FLOAT_DOWNCAST_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], downcast='float')
+        for col in INTEGER_DOWNCAST_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+        
+        # Group keys hash as integer codes instead of Python strings
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
+        # Parse and index dates once so the analyzers can resample directly
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'], format='ISO8601')
+            if not df['Date'].is_monotonic_increasing:
+                df = df.sort_values('Date', kind='stable', ignore_index=True)
+            df = df.set_index('Date', drop=False)
+        
+        return df
+    
+    def _analyze_trends(self, df: pd.DataFrame, basic_metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze profit and sales trends"""
+        if 'Profit' not in df.columns:
+            return {}
+        
+     
+        if 'Date' in df.columns:
+            # Rows are sorted by date, so the first and last day buckets are contiguous runs
+            dates = df['Date'].to_numpy()
+            profit_values = df['Profit'].to_numpy()
+            first_end = np.searchsorted(dates, dates[0], side='right')
+            last_start = np.searchsorted(dates, dates[-1], side='left')
+            first_profit = _sum64(profit_values[:first_end])
+            last_profit = _sum64(profit_values[last_start:])
+            
+         
+            if dates[0] != dates[-1]:
+                recent_trend = "upward" if last_profit > first_profit else "downward"
+                profit_change = ((last_profit - first_profit) / abs(first_profit)) * 100 if first_profit != 0 else 0
+            else:
+                recent_trend = "stable"
+                profit_change = 0
+        else:
+           
+            profit_values = df['Profit'].values
+            if len(profit_values) >= 2:
+               
+                recent_trend = "upward" if profit_values[-1] > profit_values[0] else "downward"
+                profit_change = ((profit_values[-1] - profit_values[0]) / abs(profit_values[0])) * 100 if profit_values[0] != 0 else 0
+            else:
+                recent_trend = "stable"
+                profit_change = 0
+        
+        return {
+            "trend_direction": recent_trend,
+            "profit_change_percent": profit_change,
+            "total_profit": basic_metrics["total_profit"],
+            "avg_daily_profit": basic_metrics["avg_profit"]
+        }
+    
+    def _analyze_quarters(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Analyze quarterly performance"""
+        if 'Date' not in df.columns or 'Profit' not in df.columns:
+            return {}
+        
+       
+        quarterly_sums, labels = self._quarterly_sums(df)
+        
+        if len(labels) < 2:
+            return {"quarterly_analysis": "Insufficient data for quarterly analysis"}
+        
+      
+        profit = quarterly_sums['Profit']
+        
+        # One ndarray pass for the quarter-over-quarter changes; quarters that
+        # follow a zero-profit quarter have no defined change and are skipped
+        previous = profit[:-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            changes = np.where(previous != 0, np.diff(profit) / previous * 100, np.nan)
+        defined = ~np.isnan(changes)
+        changes = changes[defined]
+        change_labels = labels[1:][defined]
+        
+        if len(changes) == 0:
+            return {"quarterly_analysis": "Insufficient data for quarterly analysis"}
+        
+        return {
+            "quarterly_profit": dict(zip(labels.tolist(), profit.tolist())),
+            "quarterly_profit_changes": dict(zip(change_labels.tolist(), changes.tolist())),
+            "last_3_quarters_avg_change": changes[-3:].mean(),
+            "quarterly_volatility": changes.std(ddof=1) if len(changes) > 1 else np.nan,
+            "best_quarter": changes.max(),
+            "worst_quarter": changes.min()
+        }
+    
+    def _quarterly_sums(self, df: pd.DataFrame) -> Tuple[Dict[str, np.ndarray], pd.Index]:
+        """Sum the value columns per calendar quarter in one sweep over the date-sorted frame"""
+        dates = df.index
+        if dates.hasnans:
+            df = df[dates.notna()]
+            dates = df.index
+        if len(df) == 0:
+            return {}, pd.Index([])
+        
+        # Integer quarter codes are non-decreasing, so each quarter is one contiguous run
+        q_codes = dates.year.to_numpy() * 4 + (dates.quarter.to_numpy() - 1)
+        offsets = np.flatnonzero(np.diff(q_codes, prepend=q_codes[0] - 1))
+        
+        cols = [c for c in QUARTERLY_COLUMNS if c in df.columns]
+        values = np.nan_to_num(df[cols].to_numpy(dtype='float64'))
+        sums = np.add.reduceat(values, offsets, axis=0)
+        
+        labels = dates[offsets].to_period('Q').strftime('%Y-Q%q')
+        return {col: sums[:, i] for i, col in enumerate(cols)}, labels
+    
+    def _analyze_performance(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Analyze overall performance metrics"""
+        if 'Profit' not in df.columns:
+            return {}
+        
+       
+        total_profit = _sum64(df['Profit'])
+        avg_profit = total_profit / df['Profit'].count() if df['Profit'].count() else np.nan
+        profit_std = df['Profit'].std()
+        
+      
+        total_gs = _sum64(df['Gross Sales']) if 'Gross Sales' in df.columns else 0.0
+        profit_margin = (total_profit / total_gs * 100) if total_gs > 0 else 0.0
+        
+       
+        efficiency_metrics = {}
+        if 'Units Sold' in df.columns:
+            total_units = _sum64(df['Units Sold'])
+            efficiency_metrics['profit_per_unit'] = total_profit / total_units if total_units > 0 else 0
+        
+        return {
+            "total_profit": total_profit,
+            "avg_profit": avg_profit,
+            "profit_std": profit_std,
+            "profit_margin_percent": profit_margin,
+            "total_gross_sales": total_gs,
+            **efficiency_metrics
+        }
+    
+    def _group_dim(self, df: pd.DataFrame, col: str) -> pd.DataFrame:
+        """Aggregate profit, sales and units by a single dimension in one groupby pass"""
+        if len(df) > GROUP_KERNEL_MIN_ROWS:
+            codes, uniques = pd.factorize(df[col], sort=False)
+            arrays = _group_agg5(
+                codes,
+                df['Profit'].to_numpy(),
+                df['Gross Sales'].to_numpy(),
+                df['Units Sold'].to_numpy(),
+                len(uniques)
+            )
+            grouped = pd.DataFrame(arrays, index=pd.Index(uniques, name=col))
+        else:
+            # Small frames: upcast the projected value columns so group sums keep float64 precision
+            values = df[[col, 'Profit', 'Gross Sales', 'Units Sold']].astype({
+                'Profit': 'float64', 'Gross Sales': 'float64', 'Units Sold': 'float64'
+            })
+            grouped = values.groupby(col, sort=False, observed=True).agg(
+                profit_sum=('Profit', 'sum'),
+                profit_mean=('Profit', 'mean'),
+                profit_count=('Profit', 'count'),
+                gross_sales=('Gross Sales', 'sum'),
+                units_sold=('Units Sold', 'sum')
+            )
+        
+        profit_sum = grouped['profit_sum'].to_numpy()
+        gross_sales = grouped['gross_sales'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            grouped['profit_margin'] = np.where(gross_sales > 0, profit_sum / gross_sales * 100, 0.0)
+        return grouped
+    
+    def _analyze_dimension(self, df: pd.DataFrame, col: str, name: str) -> Dict[str, Any]:
+        """Analyze performance by the given dimension column"""
+        if col not in df.columns or 'Profit' not in df.columns:
+            return {}
+        
+        grouped = self._group_dim(df, col)
+        uniques = grouped.index
+        profit_sum_arr = grouped['profit_sum'].to_numpy()
+        
+        return {
+            f"{name}_performance": self._table_payload(grouped),
+            f"best_{name}": uniques[int(np.argmax(profit_sum_arr))],
+            f"worst_{name}": uniques[int(np.argmin(profit_sum_arr))]
+        }
+    
+    def _table_payload(self, table: pd.DataFrame) -> Dict[str, Any]:
+        """Serialize an aggregate table as index/columns/values lists with a single ndarray copy"""
+        return {
+            "index": table.index.tolist(),
+            "columns": table.columns.tolist(),
+            "values": table.round(2).to_numpy().tolist()
+        }
+    
+    def _analyze_segments(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Analyze performance by segment"""
+        return self._analyze_dimension(df, 'Segment', 'segment')
+    
+    def _analyze_countries(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Analyze performance by country"""
+        return self._analyze_dimension(df, 'Country', 'country')
+    
+    def _analyze_products(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Analyze performance by product"""
+        return self._analyze_dimension(df, 'Product', 'product')
+    
+    def _calculate_basic_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Calculate basic financial metrics"""
+        metrics = {}
+        
+        num_cols = [c for c in BASIC_METRIC_COLUMNS if c in df.columns]
+        if not num_cols:
+            return metrics
+        
+        # Single columnar pass for every reduction instead of one scan per metric;
+        # sum and mean accumulate in float64 over the downcast columns
+        agg = df[num_cols].agg(['max', 'min', 'count']).astype('float64')
+        agg.loc['sum'] = [_sum64(df[c]) for c in num_cols]
+        agg.loc['mean'] = agg.loc['sum'] / agg.loc['count']
+        
+        if 'Profit' in agg.columns:
+            profit = agg['Profit']
+            metrics.update({
+                "total_profit": profit['sum'],
+                "max_profit": profit['max'],
+                "min_profit": profit['min'],
+                "avg_profit": profit['mean']
+            })
+        
+        if 'Gross Sales' in agg.columns:
+            sales = agg['Gross Sales']
+            metrics.update({
+                "total_sales": sales['sum'],
+                "avg_sales": sales['mean']
+            })
+        
+        if 'Units Sold' in agg.columns:
+            units = agg['Units Sold']
+            metrics.update({
+                "total_units": round(units['sum'], 0),
+                "avg_units": units['mean']
+            })
+        
+        if 'COGS' in agg.columns:
+            cogs = agg['COGS']
+            metrics.update({
+                "total_cogs": cogs['sum'],
+                "avg_cogs": cogs['mean']
+            })
+        
+        return metrics
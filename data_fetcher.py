@@ -1,219 +1,394 @@
-import pandas as pd
-from typing import Dict, Any, List, Optional
-from .base_agent import BaseAgent, AgentStatus, AgentResult
-import logging
-import os
-
-class DataFetcherAgent(BaseAgent):
-    def __init__(self):
-        super().__init__(
-            agent_id="data_fetcher",
-            role="Data Fetcher",
-            description="Fetches financial data from Excel file"
-        )
-        self.excel_file = "04-01-Financial Sample Data.xlsx"
-        
-    def can_handle(self, task: str) -> bool:
-        """Check if task involves data fetching"""
-        keywords = ["fetch", "get", "download", "data", "financial", "stock", "price", "quarter", "quarterly"]
-        return any(keyword in task.lower() for keyword in keywords)
-        
-    def get_capabilities(self) -> List[str]:
-        return [
-            "Fetch financial sales data",
-            "Get profit and revenue data",
-            "Download quarterly/annual financial data",
-            "Retrieve segment and country data",
-            "Get product performance data"
-        ]
-        
-    async def execute(self, task: str, context: Dict[str, Any] = None) -> AgentResult:
-        """Fetch financial data from Excel file based on task requirements"""
-        try:
-            self.update_status(AgentStatus.WORKING)
-         
-            if not os.path.exists(self.excel_file):
-                raise FileNotFoundError(f"Excel file {self.excel_file} not found")
-            
-            self.logger.info(f"Loading financial data from {self.excel_file}")
-            df = pd.read_excel(self.excel_file)
-            
-         
-            filters = self._extract_filters(task, context)
-            
-          
-            filtered_df = self._apply_filters(df, filters)
-            
-          
-            if 'Date' in filtered_df.columns:
-                filtered_df['Date'] = pd.to_datetime(filtered_df['Date'])
-                filtered_df = filtered_df.sort_values('Date')
-           
-            
-           
-            result_data = {
-                "raw_data": filtered_df.to_dict('records'),
-                "summary_stats": self._calculate_summary_stats(filtered_df),
-                "filters_applied": filters,
-                "data_points": len(filtered_df),
-                "columns": filtered_df.columns.tolist(),
-                "date_range": self._get_date_range(filtered_df)
-            }
-            
-         
-            self.add_to_context("financial_data", result_data)
-            self.add_to_context("dataframe", filtered_df)
-            
-            self.update_status(AgentStatus.COMPLETED)
-            self.store_result(result_data, {"data_points": len(filtered_df)})
-            
-            return AgentResult(
-                agent_id=self.agent_id,
-                status=AgentStatus.COMPLETED,
-                data=result_data,
-                metadata={"data_points": len(filtered_df)}
-            )
-            
-        except Exception as e:
-            self.logger.error(f"Error fetching data: {str(e)}")
-            self.update_status(AgentStatus.ERROR)
-            return AgentResult(
-                agent_id=self.agent_id,
-                status=AgentStatus.ERROR,
-                data=None,
-                error=str(e)
-            )
-    
-    def _extract_filters(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract filters from task for Excel data"""
-        filters = {}
-        task_lower = task.lower()
-        
-       
-        segments = ["government", "midmarket", "midmarkets", "channel partners", "enterprise", "small business"]
-        for segment in segments:
-            if segment in task_lower:
-                filters["segment"] = segment.title()
-                break
-        
-       
-        countries = ["canada", "germany", "france", "mexico", "usa", "united states"]
-        for country in countries:
-            if country in task_lower:
-                filters["country"] = country.title()
-                break
-        
-       
-        products = ["carretera", "montana", "paseo", "vente", "amarilla", "touring"]
-        for product in products:
-            if product in task_lower:
-                filters["product"] = product.title()
-                break
-        
-       
-        if "last" in task_lower:
-            if "3" in task_lower or "three" in task_lower:
-                filters["quarters"] = 3
-            elif "2" in task_lower or "two" in task_lower:
-                filters["quarters"] = 2
-            elif "1" in task_lower or "one" in task_lower:
-                filters["quarters"] = 1
-            elif "month" in task_lower:
-                filters["months"] = 1
-            elif "year" in task_lower:
-                filters["years"] = 1
-        
-        return filters
-    
-    def _apply_filters(self, df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
-        """Apply filters to the dataframe"""
-        filtered_df = df.copy()
-        
-       
-        if "segment" in filters:
-            filtered_df = filtered_df[filtered_df["Segment"].str.contains(filters["segment"], case=False, na=False)]
-        
-       
-        if "country" in filters:
-            filtered_df = filtered_df[filtered_df["Country"].str.contains(filters["country"], case=False, na=False)]
-        
-       
-        if "product" in filters:
-            filtered_df = filtered_df[filtered_df["Product"].str.contains(filters["product"], case=False, na=False)]
-        
-       
-        if "Date" in filtered_df.columns:
-           
-            filtered_df["Date"] = pd.to_datetime(filtered_df["Date"])
-            
-            if "quarters" in filters:
-               
-                quarters = filters["quarters"]
-                latest_date = filtered_df["Date"].max()
-                quarter_start = latest_date - pd.DateOffset(months=quarters * 3)
-                filtered_df = filtered_df[filtered_df["Date"] >= quarter_start]
-            elif "months" in filters:
-               
-                months = filters["months"]
-                latest_date = filtered_df["Date"].max()
-                month_start = latest_date - pd.DateOffset(months=months)
-                filtered_df = filtered_df[filtered_df["Date"] >= month_start]
-            elif "years" in filters:
-               
-                years = filters["years"]
-                latest_date = filtered_df["Date"].max()
-                year_start = latest_date - pd.DateOffset(years=years)
-                filtered_df = filtered_df[filtered_df["Date"] >= year_start]
-       
-        
-        return filtered_df
-    
-    def _calculate_summary_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Calculate summary statistics for the filtered data"""
-        stats = {}
-        
-      
-        if "Profit" in df.columns:
-            stats["total_profit"] = df["Profit"].sum()
-            stats["avg_profit"] = df["Profit"].mean()
-            stats["profit_std"] = df["Profit"].std()
-        
-        if "Gross Sales" in df.columns:
-            stats["total_gross_sales"] = df["Gross Sales"].sum()
-            stats["avg_gross_sales"] = df["Gross Sales"].mean()
-        
-        if "COGS" in df.columns:
-            stats["total_cogs"] = df["COGS"].sum()
-            stats["avg_cogs"] = df["COGS"].mean()
-        
-        if "Units Sold" in df.columns:
-            stats["total_units_sold"] = df["Units Sold"].sum()
-            stats["avg_units_sold"] = df["Units Sold"].mean()
-        
-       
-        if "Date" in df.columns:
-            stats["date_range"] = {
-                "start": df["Date"].min().strftime("%Y-%m-%d"),
-                "end": df["Date"].max().strftime("%Y-%m-%d")
-            }
-        else:
-            stats["date_range"] = {"start": "N/A", "end": "N/A"}
-        
-      
-        if "Segment" in df.columns:
-            stats["segment_breakdown"] = df["Segment"].value_counts().to_dict()
-        
-      
-        if "Country" in df.columns:
-            stats["country_breakdown"] = df["Country"].value_counts().to_dict()
-        
-        return stats
-    
-    def _get_date_range(self, df: pd.DataFrame) -> Dict[str, str]:
-        """Get date range of the filtered data"""
-        if "Date" in df.columns and not df.empty:
-            return {
-                "start": df["Date"].min().strftime("%Y-%m-%d"),
-                "end": df["Date"].max().strftime("%Y-%m-%d")
-            }
-        return {"start": "N/A", "end": "N/A"}
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+from .base_agent import BaseAgent, AgentStatus, AgentResult
+import asyncio
+import importlib.util
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+
+CAN_HANDLE_KEYWORDS = frozenset({"fetch", "get", "download", "data", "financial", "stock", "price", "quarter", "quarterly"})
+CAN_HANDLE_PATTERN = re.compile("|".join(sorted(CAN_HANDLE_KEYWORDS)))
+ROLE = "Data Fetcher"
+DESCRIPTION = "Fetches financial data from Excel file"
+CAPABILITIES = (
+    "Fetch financial sales data",
+    "Get profit and revenue data",
+    "Download quarterly/annual financial data",
+    "Retrieve segment and country data",
+    "Get product performance data",
+)
+
+# Rust-backed reader parses XLSX much faster than openpyxl; fall back when it is not installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+
+# Parsed workbooks are snapshotted in this directory next to the workbook, so cold starts skip the XLSX parse
+# from whichever directory the app is launched
+SNAPSHOT_DIR = ".cache"
+
+# Filter key -> column it matches against
+FILTER_COLUMNS = {
+    "segment": "Segment",
+    "country": "Country",
+    "product": "Product"
+}
+
+# Filter key -> recognised task keywords, in priority order
+FILTER_VOCABULARY = {
+    "segment": ("government", "midmarket", "midmarkets", "channel partners", "enterprise", "small business"),
+    "country": ("canada", "germany", "france", "mexico", "usa", "united states"),
+    "product": ("carretera", "montana", "paseo", "vente", "amarilla", "touring")
+}
+
+# Period keywords honoured after "last", in priority order, with the filter they set
+PERIOD_KEYWORDS = (
+    ("3", "quarters", 3), ("three", "quarters", 3),
+    ("2", "quarters", 2), ("two", "quarters", 2),
+    ("1", "quarters", 1), ("one", "quarters", 1),
+    ("month", "months", 1),
+    ("year", "years", 1)
+)
+
+# Keyword -> (group, rank) so one scan can keep the highest-priority hit per group
+FILTER_TOKENS = {
+    **{token: (key, rank) for key, tokens in FILTER_VOCABULARY.items() for rank, token in enumerate(tokens)},
+    **{token: ("period", rank) for rank, (token, _, _) in enumerate(PERIOD_KEYWORDS)}
+}
+
+# Unanchored, so keywords match anywhere in the task; at a shared start position the
+# higher-priority keyword wins, e.g. "midmarket" over "midmarkets"
+FILTER_TOKEN_PATTERN = re.compile("|".join(re.escape(token) for token in FILTER_TOKENS))
+
+# Column -> (stat name, reduction) pairs computed in one aggregation
+SUMMARY_AGGREGATIONS = {
+    "Profit": (("total_profit", "sum"), ("avg_profit", "mean"), ("profit_std", "std")),
+    "Gross Sales": (("total_gross_sales", "sum"), ("avg_gross_sales", "mean")),
+    "COGS": (("total_cogs", "sum"), ("avg_cogs", "mean")),
+    "Units Sold": (("total_units_sold", "sum"), ("avg_units_sold", "mean"))
+}
+
+# Reductions over a column's non-missing float64 values, matching pandas' skipna results
+SUMMARY_REDUCTIONS = {
+    "sum": lambda values: values.sum(),
+    "mean": lambda values: values.mean() if len(values) else np.nan,
+    "std": lambda values: values.std(ddof=1) if len(values) > 1 else np.nan
+}
+
+@lru_cache(maxsize=256)
+def _parse_task(task_lower: str) -> Tuple[Tuple[str, Any], ...]:
+    """Parse filter key/value pairs from a lowercased task, memoized for repeated requests"""
+    filters = []
+    
+    # Single pass over the task, keeping the best-ranked keyword per group
+    best = {}
+    for match in FILTER_TOKEN_PATTERN.finditer(task_lower):
+        group, rank = FILTER_TOKENS[match.group()]
+        if rank < best.get(group, (len(FILTER_TOKENS), None))[0]:
+            best[group] = (rank, match.group())
+    
+    for key in FILTER_VOCABULARY:
+        if key in best:
+            filters.append((key, best[key][1].title()))
+    
+    # Checked on its own since "last" can overlap the end of another keyword
+    if "period" in best and "last" in task_lower:
+        _, period, amount = PERIOD_KEYWORDS[best["period"][0]]
+        filters.append((period, amount))
+    
+    # Immutable so cached entries cannot be altered through a caller's copy
+    return tuple(filters)
+
+class DataFetcherAgent(BaseAgent):
+    # Parsed workbook frames and their filter buckets keyed by (path, mtime), shared across instances
+    _CACHE: Dict[Tuple[str, float], Tuple[pd.DataFrame, Dict[str, Dict[Any, np.ndarray]]]] = {}
+    _CACHE_LOCK = threading.Lock()
+    
+    def __init__(self):
+        super().__init__(
+            agent_id="data_fetcher",
+            role=ROLE,
+            description=DESCRIPTION
+        )
+        self.excel_file = "04-01-Financial Sample Data.xlsx"
+        
+    def can_handle(self, task: str) -> bool:
+        """Check if task involves data fetching"""
+        return CAN_HANDLE_PATTERN.search(task.lower()) is not None
+        
+    def get_capabilities(self) -> List[str]:
+        return list(CAPABILITIES)
+        
+    async def execute(self, task: str, context: Dict[str, Any] = None) -> AgentResult:
+        """Fetch financial data from Excel file based on task requirements"""
+        # Parsing and filtering are blocking pandas work, so keep them off the event loop
+        return await asyncio.to_thread(self._execute_sync, task, context)
+    
+    def _execute_sync(self, task: str, context: Dict[str, Any] = None) -> AgentResult:
+        """Blocking body of execute, run in a worker thread"""
+        try:
+            self.update_status(AgentStatus.WORKING)
+         
+            df, buckets = self._load_dataframe()
+            
+         
+            filters = self._extract_filters(task, context)
+            
+          
+            filtered_df = self._apply_filters(df, filters, buckets)
+            
+           
+            # Column-oriented payload: one array per column instead of one dict per row
+            raw_data = {col: filtered_df[col].to_numpy() for col in filtered_df.columns}
+            
+            summary_stats = self._calculate_summary_stats(filtered_df)
+            
+            result_data = {
+                "raw_data": raw_data,
+                "summary_stats": summary_stats,
+                "filters_applied": filters,
+                "data_points": len(filtered_df),
+                "columns": list(raw_data.keys()),
+                "date_range": summary_stats["date_range"]
+            }
+            
+         
+            self.add_to_context("financial_data", result_data)
+            self.add_to_context("dataframe", filtered_df)
+            
+            self.update_status(AgentStatus.COMPLETED)
+            # The stored result is the one handed back to the caller
+            return self.store_result(result_data, {"data_points": len(filtered_df)})
+            
+        except Exception as e:
+            self.logger.error("Error fetching data: %s", e)
+            self.update_status(AgentStatus.ERROR)
+            return AgentResult(
+                agent_id=self.agent_id,
+                status=AgentStatus.ERROR,
+                data=None,
+                error=str(e)
+            )
+    
+    def _load_dataframe(self) -> Tuple[pd.DataFrame, Dict[str, Dict[Any, np.ndarray]]]:
+        """Load the Excel data and its filter buckets, reusing them until the file changes"""
+        if not os.path.exists(self.excel_file):
+            raise FileNotFoundError(f"Excel file {self.excel_file} not found")
+        
+        key = (self.excel_file, os.path.getmtime(self.excel_file))
+        # Held across the parse so concurrent requests load the file only once
+        with self._CACHE_LOCK:
+            cached = self._load_cached(key)
+        
+        df, buckets = cached
+        return df.copy(deep=False), buckets
+    
+    def _load_cached(self, key: Tuple[str, float]) -> Tuple[pd.DataFrame, Dict[str, Dict[Any, np.ndarray]]]:
+        """Return the cache entry for key, parsing the workbook on a miss"""
+        cached = self._CACHE.get(key)
+        if cached is None:
+            cached = self._read_snapshot(key)
+            if cached is None:
+                cached = self._parse_workbook()
+                self._write_snapshot(key, cached)
+            
+            # Drop frames parsed from older versions of the same file
+            for stale in [k for k in self._CACHE if k[0] == self.excel_file]:
+                del self._CACHE[stale]
+            self._CACHE[key] = cached
+        
+        return cached
+    
+    def _parse_workbook(self) -> Tuple[pd.DataFrame, Dict[str, Dict[Any, np.ndarray]]]:
+        """Parse the workbook and prepare the frame and filter buckets"""
+        self.logger.info("Loading financial data from %s", self.excel_file)
+        df = pd.read_excel(self.excel_file, sheet_name=0, engine=EXCEL_ENGINE)
+        if 'Date' in df.columns:
+            # Missing dates sort first so the last row always holds the latest date
+            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+            df.sort_values('Date', kind='stable', na_position='first', inplace=True)
+        
+        # Few distinct labels repeated on every row: store them as integer codes
+        for col in FILTER_COLUMNS.values():
+            if col in df.columns:
+                df[col] = df[col].str.strip().astype('category')
+        
+        return df, self._build_buckets(df)
+    
+    def _build_buckets(self, df: pd.DataFrame) -> Dict[str, Dict[Any, np.ndarray]]:
+        """Row positions per distinct lowercased value, so filters never rescan the columns"""
+        return {
+            col: df.groupby(df[col].str.lower(), sort=False).indices
+            for col in FILTER_COLUMNS.values() if col in df.columns
+        }
+    
+    def _snapshot_path(self) -> str:
+        """Location of the on-disk snapshot for the current workbook"""
+        workbook = os.path.abspath(self.excel_file)
+        return os.path.join(os.path.dirname(workbook), SNAPSHOT_DIR, os.path.basename(workbook) + ".npz")
+    
+    def _snapshot_key(self, key: Tuple[str, float]) -> List[str]:
+        """Workbook version plus the pandas version that parsed it"""
+        return [os.path.abspath(key[0]), repr(key[1]), pd.__version__]
+    
+    def _read_snapshot(self, key: Tuple[str, float]) -> Optional[Tuple[pd.DataFrame, Dict[str, Dict[Any, np.ndarray]]]]:
+        """Load the snapshot written for this exact workbook version, if any"""
+        path = self._snapshot_path()
+        if not os.path.exists(path):
+            return None
+        try:
+            # Plain arrays only: allow_pickle=False means a planted file cannot run code
+            with np.load(path, allow_pickle=False) as snapshot:
+                if snapshot["key"].tolist() != self._snapshot_key(key):
+                    return None
+                columns = {}
+                for i, (name, kind) in enumerate(zip(snapshot["columns"].tolist(), snapshot["kinds"].tolist())):
+                    values = snapshot[f"values_{i}"]
+                    if kind == "category":
+                        labels = pd.Index(snapshot[f"labels_{i}"].tolist(), dtype=object)
+                        values = pd.Categorical.from_codes(values, categories=labels)
+                    elif kind == "object":
+                        # Code -1 marks a missing value and picks the trailing NaN
+                        labels = np.array(snapshot[f"labels_{i}"].tolist() + [np.nan], dtype=object)
+                        values = labels[values]
+                    columns[name] = values
+                df = pd.DataFrame(columns, index=snapshot["index"])
+        except Exception as e:
+            self.logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+            return None
+        return df, self._build_buckets(df)
+    
+    def _write_snapshot(self, key: Tuple[str, float], cached: Tuple[pd.DataFrame, Dict[str, Dict[Any, np.ndarray]]]):
+        """Persist the parsed workbook; failures only cost the next cold start"""
+        df, _ = cached
+        arrays = {
+            "key": np.array(self._snapshot_key(key)),
+            "columns": np.array([str(name) for name in df.columns]),
+            "index": df.index.to_numpy()
+        }
+        kinds = []
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                kind, codes, labels = "category", series.cat.codes.to_numpy(), series.cat.categories
+            elif series.dtype == object:
+                codes, labels = pd.factorize(series)
+                kind = "object"
+            else:
+                kind, codes, labels = "values", series.to_numpy(), None
+            # Only string labels and non-object arrays load back without pickle
+            if not isinstance(name, str) or (labels is not None and not all(isinstance(label, str) for label in labels)):
+                self.logger.info("Not snapshotting %s: column %r needs pickling", self.excel_file, name)
+                return
+            kinds.append(kind)
+            arrays[f"values_{i}"] = codes
+            if labels is not None:
+                arrays[f"labels_{i}"] = np.array(list(labels), dtype=str)
+        arrays["kinds"] = np.array(kinds)
+        if df.index.dtype == object or any(array.dtype == object for array in arrays.values()):
+            self.logger.info("Not snapshotting %s: it needs pickling", self.excel_file)
+            return
+        
+        path = self._snapshot_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning("Could not write snapshot %s: %s", path, e)
+    
+    def _extract_filters(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract filters from task for Excel data"""
+        # Filters depend on the task text alone; the context does not change them
+        return dict(_parse_task(task.lower()))
+    
+    def _apply_filters(self, df: pd.DataFrame, filters: Dict[str, Any], buckets: Dict[str, Dict[Any, np.ndarray]]) -> pd.DataFrame:
+        """Apply filters to the dataframe"""
+        # Sorted row positions passing every filter so far; None means all rows
+        positions = None
+        
+        for key, col in FILTER_COLUMNS.items():
+            if key in filters:
+                # Plain substring test against the distinct lowercased values, then gather their rows
+                needle = filters[key].lower()
+                selected = [rows for label, rows in buckets[col].items() if needle in label]
+                rows = np.sort(np.concatenate(selected)) if selected else np.empty(0, dtype=np.intp)
+                positions = rows if positions is None else np.intersect1d(positions, rows, assume_unique=True)
+        
+        if "Date" in df.columns:
+            offset = None
+            if "quarters" in filters:
+                offset = pd.DateOffset(months=filters["quarters"] * 3)
+            elif "months" in filters:
+                offset = pd.DateOffset(months=filters["months"])
+            elif "years" in filters:
+                offset = pd.DateOffset(years=filters["years"])
+            
+            if offset is not None:
+                dates = df["Date"].to_numpy()
+                candidates = dates if positions is None else dates[positions]
+                # The cached frame is date-sorted, so the latest date is the last value
+                if len(candidates):
+                    start = (pd.Timestamp(candidates[-1]) - offset).to_datetime64()
+                    in_window = np.flatnonzero(candidates >= start)
+                    positions = in_window if positions is None else positions[in_window]
+                else:
+                    positions = np.empty(0, dtype=np.intp)
+        
+        # With no filters the input frame is returned as is
+        return df if positions is None else df.take(positions)
+    
+    def _calculate_summary_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Calculate summary statistics for the filtered data"""
+        stats = {}
+        
+        # Reduce each column's ndarray directly, skipping the pandas dispatch layer
+        for col, pairs in SUMMARY_AGGREGATIONS.items():
+            if col in df.columns:
+                values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                values = values[~np.isnan(values)]
+                for name, func in pairs:
+                    stats[name] = SUMMARY_REDUCTIONS[func](values)
+        
+       
+        stats["date_range"] = self._get_date_range(df)
+        
+      
+        if "Segment" in df.columns:
+            stats["segment_breakdown"] = self._value_counts(df["Segment"])
+        
+      
+        if "Country" in df.columns:
+            stats["country_breakdown"] = self._value_counts(df["Country"])
+        
+        return stats
+    
+    def _value_counts(self, series: pd.Series) -> Dict[Any, int]:
+        """Count occurrences per value, most frequent first"""
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            return series.value_counts().to_dict()
+        
+        # Categorical columns count their integer codes instead of hashing labels
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        order = np.argsort(-counts, kind='stable')
+        categories = series.cat.categories
+        return {categories[i]: int(counts[i]) for i in order if counts[i]}
+    
+    def _get_date_range(self, df: pd.DataFrame) -> Dict[str, str]:
+        """Get date range of the filtered data"""
+        if "Date" in df.columns and not df.empty:
+            dates = df["Date"]
+            # Rows keep the load-time date order with missing dates first, so the ends are the bounds
+            start = dates.iat[0]
+            if pd.isna(start):
+                start = dates.min()
+            return {
+                "start": start.strftime("%Y-%m-%d"),
+                "end": dates.iat[-1].strftime("%Y-%m-%d")
+            }
+        return {"start": "N/A", "end": "N/A"}
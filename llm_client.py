@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import httpx
+from config import LLM_CACHE_FILE, OPENAI_API_KEY
+
+if TYPE_CHECKING:
+    import openai
+
+logger = logging.getLogger("LLMClient")
+
+# Connection limits for the OpenAI HTTP pool; HTTP/2 multiplexing needs the optional h2 package
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# httpx async pools are bound to the event loop that created them, and the
+# Streamlit app runs each request under its own asyncio.run, so keep one client per loop
+_clients = weakref.WeakKeyDictionary()
+
+def get_client() -> "openai.AsyncOpenAI":
+    """Return the AsyncOpenAI client for the running event loop, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # Imported here because the SDK takes about half a second to load and cached runs never need it
+        import openai
+        
+        # Reused so each call on this loop skips the TCP and TLS handshake
+        client = _clients[loop] = openai.AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS)
+        )
+    return client
+
+async def stream_completion(**request: Any) -> str:
+    """Stream a chat completion and return the full text"""
+    stream = await get_client().chat.completions.create(stream=True, **request)
+    buffer = io.StringIO()
+    async for chunk in stream:
+        # Usage and role-only chunks carry no text
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            buffer.write(delta)
+    return buffer.getvalue()
+
+# Seconds between status checks while a batch job runs; batches finish within the 24h window
+BATCH_POLL_INTERVAL = 30
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+async def batch_completion(poll_interval: float = BATCH_POLL_INTERVAL, **request: Any) -> str:
+    """Run one chat completion through the discounted batch API and wait for its result"""
+    client = get_client()
+    line = {"custom_id": "request-0", "method": "POST", "url": "/v1/chat/completions", "body": request}
+    batch_input = await client.files.create(
+        file=("batch_input.jsonl", (json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8")),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_input.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info("Submitted batch %s", batch.id)
+    
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+    
+    output = await client.files.content(batch.output_file_id)
+    for output_line in output.text.splitlines():
+        if not output_line.strip():
+            continue
+        entry = json.loads(output_line)
+        if entry.get("custom_id") == line["custom_id"]:
+            return entry["response"]["body"]["choices"][0]["message"]["content"]
+    raise RuntimeError(f"Batch {batch.id} returned no result")
+
+# Completions keyed by a hash of model, temperature and messages, shared by all agents
+_LLM_CACHE: Dict[str, str] = {}
+_CACHE_LOCK = threading.Lock()
+_cache_loaded = False
+
+def cache_key(model: str, temperature: float, messages: List[Dict[str, Any]]) -> str:
+    """SHA-256 key for an exact chat request"""
+    prompt = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(f"{model}|{temperature}|{prompt}".encode("utf-8")).hexdigest()
+
+def _load_disk_cache():
+    """Read persisted completions once, skipping any malformed lines"""
+    global _cache_loaded
+    _cache_loaded = True
+    if not LLM_CACHE_FILE or not os.path.exists(LLM_CACHE_FILE):
+        return
+    try:
+        with open(LLM_CACHE_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    _LLM_CACHE[entry["key"]] = entry["completion"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+    except OSError as e:
+        logger.warning("Could not read LLM cache %s: %s", LLM_CACHE_FILE, e)
+
+def get_cached(key: str) -> Optional[str]:
+    """Return the cached completion for key, if any"""
+    with _CACHE_LOCK:
+        if not _cache_loaded:
+            _load_disk_cache()
+        return _LLM_CACHE.get(key)
+
+def store(key: str, completion: str):
+    """Remember a completion in memory and append it to the disk cache"""
+    if completion is None:
+        return
+    with _CACHE_LOCK:
+        _LLM_CACHE[key] = completion
+        if not LLM_CACHE_FILE:
+            return
+        try:
+            os.makedirs(os.path.dirname(LLM_CACHE_FILE) or ".", exist_ok=True)
+            with open(LLM_CACHE_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "completion": completion}, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning("Could not write LLM cache %s: %s", LLM_CACHE_FILE, e)
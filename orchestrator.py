@@ -1,399 +1,718 @@
-import asyncio
-import logging
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
-from enum import Enum
-import openai
-from config import OPENAI_API_KEY, OPENAI_MODEL
-
-from agents import (
-    BaseAgent, AgentStatus, AgentResult,
-    DataFetcherAgent, AnalyzerAgent, VisualizerAgent, SummarizerAgent
-)
-
-class TaskStatus(Enum):
-    PENDING = "pending"
-    PLANNING = "planning"
-    EXECUTING = "executing"
-    COMPLETED = "completed"
-    ERROR = "error"
-    WAITING_FOR_CLARIFICATION = "waiting_for_clarification"
-
-@dataclass
-class TaskPlan:
-    task: str
-    agents_needed: List[str]
-    execution_order: List[str]
-    context: Dict[str, Any]
-    clarification_needed: bool = False
-    clarification_questions: List[str] = None
-
-class MultiAgentOrchestrator:
-    def __init__(self):
-        self.agents: Dict[str, BaseAgent] = {}
-        self.status = TaskStatus.PENDING
-        self.current_task = None
-        self.execution_results: Dict[str, AgentResult] = {}
-        self.logger = logging.getLogger("Orchestrator")
-        
-        # Initialize agents
-        self._initialize_agents()
-        
-    def _initialize_agents(self):
-        """Initialize all available agents"""
-        self.agents = {
-            "data_fetcher": DataFetcherAgent(),
-            "analyzer": AnalyzerAgent(),
-            "visualizer": VisualizerAgent(),
-            "summarizer": SummarizerAgent()
-        }
-        self.logger.info(f"Initialized {len(self.agents)} agents")
-    
-    async def process_request(self, user_request: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Main entry point for processing user requests"""
-        try:
-            self.status = TaskStatus.PLANNING
-            self.current_task = user_request
-            
-            # Step 1: Plan the task
-            task_plan = await self._plan_task(user_request, context or {})
-            
-            if task_plan.clarification_needed:
-                self.status = TaskStatus.WAITING_FOR_CLARIFICATION
-                return {
-                    "status": "clarification_needed",
-                    "questions": task_plan.clarification_questions,
-                    "task": user_request
-                }
-            
-            # Step 2: Execute the plan
-            self.status = TaskStatus.EXECUTING
-            execution_results = await self._execute_plan(task_plan)
-            
-            # Step 3: Aggregate results
-            final_result = await self._aggregate_results(execution_results, task_plan)
-            
-            self.status = TaskStatus.COMPLETED
-            return final_result
-            
-        except Exception as e:
-            self.logger.error(f"Error processing request: {str(e)}")
-            self.status = TaskStatus.ERROR
-            return {
-                "status": "error",
-                "error": str(e),
-                "task": user_request
-            }
-    
-    async def _plan_task(self, task: str, context: Dict[str, Any]) -> TaskPlan:
-        """Use LLM to plan which agents are needed and in what order"""
-        try:
-            # Get available agents and their capabilities
-            agent_capabilities = self._get_agent_capabilities()
-            
-            # Create planning prompt
-            planning_prompt = self._create_planning_prompt(task, agent_capabilities, context)
-            
-            # Call ChatGPT-4 for planning
-            plan_response = await self._call_llm_for_planning(planning_prompt)
-            
-            # Parse the response to create task plan
-            task_plan = self._parse_planning_response(task, plan_response, context)
-            
-            return task_plan
-            
-        except Exception as e:
-            self.logger.error(f"Error in task planning: {str(e)}")
-            # Fallback to basic planning
-            return self._create_fallback_plan(task, context)
-    
-    def _get_agent_capabilities(self) -> Dict[str, List[str]]:
-        """Get capabilities of all available agents"""
-        capabilities = {}
-        for agent_id, agent in self.agents.items():
-            capabilities[agent_id] = agent.get_capabilities()
-        return capabilities
-    
-    def _create_planning_prompt(self, task: str, agent_capabilities: Dict, context: Dict) -> str:
-        """Create prompt for task planning"""
-        prompt = f"""
-        You are a task orchestrator for a multi-agent financial analysis system. 
-        Analyze the user's request and determine which agents should be used and in what order.
-        
-        User Request: "{task}"
-        
-        Available Agents and Capabilities:
-        """
-        
-        for agent_id, capabilities in agent_capabilities.items():
-            prompt += f"\n- {agent_id}: {', '.join(capabilities)}"
-        
-        prompt += f"""
-        
-        Context: {context}
-        
-        IMPORTANT: If clarification_answers are provided in the context, use them to understand what the user wants and DO NOT ask for clarification again.
-        
-        CLARIFICATION RULES:
-        - Ask for clarification if the request is vague or ambiguous (e.g., "analyze data", "show trends", "help me")
-        - Ask for clarification if time period is not specified (e.g., "analyze profit" should ask "What time period?")
-        - Ask for clarification if scope is unclear (e.g., "compare performance" should ask "Compare what?")
-        - Ask for clarification if output format is not specified (e.g., "show me data" should ask "Do you want charts, tables, or reports?")
-        
-        Please respond with a JSON object containing:
-        1. "agents_needed": List of agent IDs that should be used
-        2. "execution_order": List of agent IDs in execution order
-        3. "clarification_needed": Boolean indicating if clarification is needed (should be false if clarification_answers exist)
-        4. "clarification_questions": List of questions if clarification is needed
-        5. "reasoning": Brief explanation of the plan
-        
-        Example response for ambiguous request:
-        {{
-            "agents_needed": [],
-            "execution_order": [],
-            "clarification_needed": true,
-            "clarification_questions": ["What specific data would you like me to analyze?", "What time period are you interested in?", "What type of analysis do you need?"],
-            "reasoning": "Request is too vague, need clarification on scope and requirements"
-        }}
-        
-        Example response for clear request:
-        {{
-            "agents_needed": ["data_fetcher", "analyzer", "visualizer", "summarizer"],
-            "execution_order": ["data_fetcher", "analyzer", "visualizer", "summarizer"],
-            "clarification_needed": false,
-            "clarification_questions": [],
-            "reasoning": "Need to fetch data, analyze it, create visualizations, and summarize results"
-        }}
-        """
-        
-        return prompt
-    
-    async def _call_llm_for_planning(self, prompt: str) -> str:
-        """Call ChatGPT-4 for task planning"""
-        try:
-            client = openai.OpenAI(api_key=OPENAI_API_KEY)
-            
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a task orchestrator. Always respond with valid JSON. Be precise and logical in your planning."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=1000,
-                temperature=0.1
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            self.logger.error(f"Error calling LLM for planning: {str(e)}")
-            raise
-    
-    def _parse_planning_response(self, task: str, response: str, context: Dict) -> TaskPlan:
-        """Parse LLM response to create task plan"""
-        import json
-        
-        try:
-            
-            response_clean = response.strip()
-            if response_clean.startswith("```json"):
-                response_clean = response_clean[7:-3]
-            elif response_clean.startswith("```"):
-                response_clean = response_clean[3:-3]
-            
-            plan_data = json.loads(response_clean)
-            
-            return TaskPlan(
-                task=task,
-                agents_needed=plan_data.get("agents_needed", []),
-                execution_order=plan_data.get("execution_order", []),
-                context=context,
-                clarification_needed=plan_data.get("clarification_needed", False),
-                clarification_questions=plan_data.get("clarification_questions", [])
-            )
-            
-        except (json.JSONDecodeError, KeyError) as e:
-            self.logger.error(f"Error parsing planning response: {str(e)}")
-            
-            return self._create_fallback_plan(task, context)
-    
-    def _create_fallback_plan(self, task: str, context: Dict) -> TaskPlan:
-        """Create a basic fallback plan when LLM planning fails"""
-        
-        default_order = ["data_fetcher", "analyzer", "visualizer", "summarizer"]
-        
-        
-        clarification_needed = not bool(context.get("clarification_answers"))
-        
-        
-        if clarification_needed:
-            
-            task_lower = task.lower()
-            vague_phrases = [
-                "help me", "what should i do", "i need information", "can you help",
-                "tell me something", "what's going on", "i want to know", "show me something",
-                "give me data", "i need help", "analyze data", "show trends", "compare performance",
-                "show me", "give me", "tell me", "what is", "how do", "can you"
-            ]
-            
-           
-            is_vague = any(phrase in task_lower for phrase in vague_phrases) or len(task.split()) <= 3
-            
-            if is_vague:
-                clarification_questions = [
-                    "What specific financial data would you like me to analyze?",
-                    "What time period are you interested in? (e.g., last quarter, last year)",
-                    "What type of analysis do you need? (e.g., trends, comparisons, summaries)",
-                    "Do you want charts, tables, or reports?"
-                ]
-                
-                return TaskPlan(
-                    task=task,
-                    agents_needed=[],
-                    execution_order=[],
-                    context=context,
-                    clarification_needed=True,
-                    clarification_questions=clarification_questions
-                )
-        
-        
-        agents_needed = []
-        task_lower = task.lower()
-        
-        if any(word in task_lower for word in ["fetch", "get", "data", "download"]):
-            agents_needed.append("data_fetcher")
-        
-        if any(word in task_lower for word in ["analyze", "analysis", "trend", "calculate"]):
-            agents_needed.append("analyzer")
-        
-        if any(word in task_lower for word in ["chart", "graph", "plot", "visualize"]):
-            agents_needed.append("visualizer")
-        
-        if any(word in task_lower for word in ["summarize", "summary", "report", "conclusion"]):
-            agents_needed.append("summarizer")
-        
-        
-        if not agents_needed:
-            agents_needed = default_order
-        
-        return TaskPlan(
-            task=task,
-            agents_needed=agents_needed,
-            execution_order=agents_needed,
-            context=context,
-            clarification_needed=False
-        )
-    
-    async def _execute_plan(self, task_plan: TaskPlan) -> Dict[str, AgentResult]:
-        """Execute the planned tasks in order"""
-        execution_results = {}
-        shared_context = task_plan.context.copy()
-        
-        for agent_id in task_plan.execution_order:
-            if agent_id not in self.agents:
-                self.logger.warning(f"Agent {agent_id} not found, skipping")
-                continue
-            
-            agent = self.agents[agent_id]
-            
-            try:
-                self.logger.info(f"Executing agent: {agent_id}")
-                
-                
-                result = await agent.execute(task_plan.task, shared_context)
-                execution_results[agent_id] = result
-                
-                
-                shared_context.update(agent.context)
-                
-                
-                if result.status == AgentStatus.ERROR:
-                    self.logger.error(f"Agent {agent_id} failed: {result.error}")
-                
-            except Exception as e:
-                self.logger.error(f"Error executing agent {agent_id}: {str(e)}")
-                execution_results[agent_id] = AgentResult(
-                    agent_id=agent_id,
-                    status=AgentStatus.ERROR,
-                    data=None,
-                    error=str(e)
-                )
-        
-        return execution_results
-    
-    async def _aggregate_results(self, execution_results: Dict[str, AgentResult], task_plan: TaskPlan) -> Dict[str, Any]:
-        """Aggregate results from all agents into final response"""
-        successful_results = {k: v for k, v in execution_results.items() if v.status == AgentStatus.COMPLETED}
-        failed_results = {k: v for k, v in execution_results.items() if v.status == AgentStatus.ERROR}
-        
-        
-        aggregated_data = {}
-        for agent_id, result in successful_results.items():
-            if result.data:
-                aggregated_data[agent_id] = result.data
-        
-        
-        summary = None
-        if "summarizer" in successful_results and successful_results["summarizer"].data:
-            summary = successful_results["summarizer"].data
-        
-        
-        visualizations = {}
-        if "visualizer" in successful_results and successful_results["visualizer"].data:
-            visualizations = successful_results["visualizer"].data
-        
-        
-        analysis = {}
-        if "analyzer" in successful_results and successful_results["analyzer"].data:
-            analysis = successful_results["analyzer"].data
-        
-        
-        financial_data = {}
-        if "data_fetcher" in successful_results and successful_results["data_fetcher"].data:
-            financial_data = successful_results["data_fetcher"].data
-        
-        return {
-            "status": "completed",
-            "task": task_plan.task,
-            "summary": summary,
-            "analysis": analysis,
-            "visualizations": visualizations,
-            "financial_data": financial_data,
-            "successful_agents": list(successful_results.keys()),
-            "failed_agents": list(failed_results.keys()),
-            "agent_status": {agent_id: result.status.value for agent_id, result in execution_results.items()},
-            "metadata": {
-                "total_agents": len(execution_results),
-                "successful_agents": len(successful_results),
-                "failed_agents": len(failed_results)
-            }
-        }
-    
-    def get_status(self) -> Dict[str, Any]:
-        """Get current orchestrator status"""
-        return {
-            "status": self.status.value,
-            "current_task": self.current_task,
-            "available_agents": list(self.agents.keys()),
-            "agent_status": {agent_id: agent.status.value for agent_id, agent in self.agents.items()}
-        }
-    
-    async def handle_clarification(self, clarification_answers: Dict[str, str]) -> Dict[str, Any]:
-        """Handle user clarification responses"""
-        if self.status != TaskStatus.WAITING_FOR_CLARIFICATION:
-            return {"error": "No clarification needed at this time"}
-        
-        
-        updated_context = {"clarification_answers": clarification_answers}
-        
-        
-        self.status = TaskStatus.PLANNING
-        
-        
-        return await self.process_request(self.current_task, updated_context)
+import asyncio
+import logging
+import re
+from collections import ChainMap
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from enum import Enum
+import orjson
+from config import OPENAI_MODEL
+import llm_client
+
+from agents import (
+    BaseAgent, AgentStatus, AgentResult,
+    DataFetcherAgent, AnalyzerAgent, VisualizerAgent, SummarizerAgent
+)
+from agents import analyzer, data_fetcher, summarizer, visualizer
+
+# Agent modules by ID; their ROLE, DESCRIPTION and CAPABILITIES constants describe an agent without constructing it
+AGENT_MODULES = {
+    "data_fetcher": data_fetcher,
+    "analyzer": analyzer,
+    "visualizer": visualizer,
+    "summarizer": summarizer
+}
+
+class TaskStatus(Enum):
+    PENDING = "pending"
+    PLANNING = "planning"
+    EXECUTING = "executing"
+    COMPLETED = "completed"
+    ERROR = "error"
+    WAITING_FOR_CLARIFICATION = "waiting_for_clarification"
+
+# The full fetch -> analyze -> visualize -> summarize pipeline
+DEFAULT_PIPELINE = ["data_fetcher", "analyzer", "visualizer", "summarizer"]
+
+# Keywords that pull each agent into a keyword-based plan, in pipeline order
+AGENT_KEYWORDS = (
+    ("data_fetcher", ("fetch", "get", "data", "download")),
+    ("analyzer", ("analyze", "analysis", "trend", "calculate")),
+    ("visualizer", ("chart", "graph", "plot", "visualize")),
+    ("summarizer", ("summarize", "summary", "report", "conclusion"))
+)
+
+# Phrases that mark a request as too vague to plan without clarification
+VAGUE_PHRASES = (
+    "help me", "what should i do", "i need information", "can you help",
+    "tell me something", "what's going on", "i want to know", "show me something",
+    "give me data", "i need help", "analyze data", "show trends", "compare performance",
+    "show me", "give me", "tell me", "what is", "how do", "can you"
+)
+
+# Single-pass scanners for the tables above; unanchored so they match substrings like the `in` checks
+AGENT_KEYWORD_IDS = {word: agent_id for agent_id, keywords in AGENT_KEYWORDS for word in keywords}
+AGENT_KEYWORD_PATTERN = re.compile("|".join(re.escape(word) for word in AGENT_KEYWORD_IDS))
+VAGUE_PATTERN = re.compile("|".join(re.escape(phrase) for phrase in VAGUE_PHRASES))
+
+# Agent -> field of the aggregated response that carries its data
+RESULT_SECTIONS = {
+    "summarizer": "summary",
+    "analyzer": "analysis",
+    "visualizer": "visualizations",
+    "data_fetcher": "financial_data"
+}
+
+# Agents whose context each agent reads; agents with all their inputs ready run concurrently
+AGENT_DEPENDENCIES = {
+    "data_fetcher": [],
+    "analyzer": ["data_fetcher"],
+    "visualizer": ["data_fetcher", "analyzer"],
+    "summarizer": ["data_fetcher", "analyzer"]
+}
+
+# System message for every planning call; the single-task planner appends its full instructions to it
+PLANNING_SYSTEM_PROMPT = "You are a task orchestrator. Always respond with valid JSON. Be precise and logical in your planning."
+
+# Planning requests arriving within this window (up to the batch size) share one LLM call
+PLAN_BATCH_WINDOW = 0.05
+PLAN_BATCH_SIZE = 8
+
+@dataclass(slots=True, frozen=True)
+class TaskPlan:
+    task: str
+    agents_needed: List[str]
+    execution_order: List[str]
+    context: Dict[str, Any]
+    clarification_needed: bool = False
+    clarification_questions: List[str] = field(default_factory=list)
+    dependencies: Dict[str, List[str]] = None
+    
+    def execution_layers(self) -> List[List[str]]:
+        """Group execution_order into levels whose agents only depend on earlier levels"""
+        dependencies = {**AGENT_DEPENDENCIES, **(self.dependencies or {})}
+        remaining = list(dict.fromkeys(self.execution_order))
+        planned = set(remaining)
+        done = set()
+        layers = []
+        
+        while remaining:
+            # Dependencies on agents outside the plan are ignored
+            layer = [
+                agent_id for agent_id in remaining
+                if all(dep in done or dep not in planned or dep == agent_id for dep in dependencies.get(agent_id, []))
+            ]
+            if not layer:
+                # Cyclic dependencies: run what is left one at a time in the planned order
+                layers.extend([agent_id] for agent_id in remaining)
+                break
+            layers.append(layer)
+            done.update(layer)
+            remaining = [agent_id for agent_id in remaining if agent_id not in done]
+        
+        return layers
+    
+    def execution_dependencies(self) -> Dict[str, List[str]]:
+        """Planned agents each agent must wait for, consistent with execution_layers"""
+        dependencies = {**AGENT_DEPENDENCIES, **(self.dependencies or {})}
+        planned = set(self.execution_order)
+        seen = set()
+        waits = {}
+        previous_layer = []
+        
+        for layer in self.execution_layers():
+            for agent_id in layer:
+                needed = [dep for dep in dependencies.get(agent_id, []) if dep in planned and dep != agent_id]
+                if all(dep in seen for dep in needed):
+                    waits[agent_id] = needed
+                else:
+                    # Part of a cycle that execution_layers serialised: wait for the agent before it
+                    waits[agent_id] = list(previous_layer)
+            seen.update(layer)
+            previous_layer = layer
+        
+        return waits
+
+class AgentRegistry(Mapping):
+    """Agents by ID, each constructed the first time it is looked up"""
+    
+    def __init__(self, factories: Dict[str, Callable[[], BaseAgent]]):
+        self._factories = factories
+        self._instances: Dict[str, BaseAgent] = {}
+    
+    def __getitem__(self, agent_id: str) -> BaseAgent:
+        agent = self._instances.get(agent_id)
+        if agent is None:
+            agent = self._instances[agent_id] = self._factories[agent_id]()
+        return agent
+    
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._factories
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+    
+    def __len__(self) -> int:
+        return len(self._factories)
+    
+    def instances(self) -> Dict[str, BaseAgent]:
+        """The agents constructed so far; unlike items() this builds nothing"""
+        return dict(self._instances)
+    
+    def spawn(self) -> "AgentRegistry":
+        """An empty registry over the same factories, for runs that must not touch these agents"""
+        return AgentRegistry(self._factories)
+    
+    def adopt(self, instances: Dict[str, BaseAgent]):
+        """Take over agents built elsewhere, replacing any constructed here"""
+        self._instances.update(instances)
+
+class MultiAgentOrchestrator:
+    def __init__(self):
+        self.agents: AgentRegistry
+        self.status = TaskStatus.PENDING
+        self.current_task = None
+        self.execution_results: Dict[str, AgentResult] = {}
+        self.logger = logging.getLogger("Orchestrator")
+        self._plan_batch_queue: Optional[asyncio.Queue] = None
+        self._plan_batch_worker: Optional[asyncio.Task] = None
+        
+        # Initialize agents
+        self._initialize_agents()
+        
+    def _initialize_agents(self):
+        """Register all available agents; each is constructed on first use"""
+        self.agents = AgentRegistry({
+            "data_fetcher": DataFetcherAgent,
+            "analyzer": AnalyzerAgent,
+            "visualizer": VisualizerAgent,
+            "summarizer": SummarizerAgent
+        })
+        self.logger.info(f"Registered {len(self.agents)} agents")
+    
+    # The agent set is fixed for the process, so capabilities and the planning prefix are built once,
+    # the first time an LLM planning call needs them
+    @cached_property
+    def _capabilities_cache(self) -> Dict[str, List[str]]:
+        return {agent_id: list(AGENT_MODULES[agent_id].CAPABILITIES) for agent_id in self.agents}
+    
+    @cached_property
+    def _planning_prompt_static(self) -> str:
+        return self._build_static_planning_prefix()
+    
+    async def process_request(self, user_request: str, context: Dict[str, Any] = None, batch: bool = False,
+                              agents: Optional[AgentRegistry] = None) -> Dict[str, Any]:
+        """Main entry point for processing user requests; batch sends the summary through the OpenAI batch API.
+        agents, when given, runs the request on those instances instead of the orchestrator's own"""
+        agents = self.agents if agents is None else agents
+        try:
+            self.status = TaskStatus.PLANNING
+            self.current_task = user_request
+            
+            # Step 1: Plan the task; the standard pipeline is recognised without an LLM round-trip
+            task_plan = self._create_standard_plan(user_request, context or {})
+            finished = None
+            if task_plan is None:
+                task_plan, finished = await self._plan_with_speculation(user_request, context or {}, agents)
+            
+            if task_plan.clarification_needed:
+                self.status = TaskStatus.WAITING_FOR_CLARIFICATION
+                return {
+                    "status": "clarification_needed",
+                    "questions": task_plan.clarification_questions,
+                    "task": user_request
+                }
+            
+            # Step 2: Execute the plan, picking up after any agents the speculative run already finished
+            self.status = TaskStatus.EXECUTING
+            execution_results = await self._execute_plan(task_plan, batch, finished, agents)
+            
+            # Step 3: Aggregate results
+            final_result = await self._aggregate_results(execution_results, task_plan)
+            
+            self.status = TaskStatus.COMPLETED
+            return final_result
+            
+        except Exception as e:
+            self.logger.error(f"Error processing request: {str(e)}")
+            self.status = TaskStatus.ERROR
+            return {
+                "status": "error",
+                "error": str(e),
+                "task": user_request
+            }
+    
+    async def process_requests(self, user_requests: List[str], context: Dict[str, Any] = None, batch: bool = False) -> List[Dict[str, Any]]:
+        """Process independent requests concurrently, returning their results in request order"""
+        # Concurrent runs on one agent would share its status and context, so every request gets its own
+        # instances; their planning calls still meet in the same planning batch
+        return list(await asyncio.gather(*(
+            self.process_request(user_request, context, batch, self.agents.spawn()) for user_request in user_requests
+        )))
+    
+    async def _plan_with_speculation(self, task: str, context: Dict[str, Any], agents: AgentRegistry) -> Tuple[TaskPlan, Optional[Dict[str, AgentResult]]]:
+        """Plan with the LLM while the keyword-predicted plan already runs; keep its results if the prediction holds"""
+        predicted = self._create_fallback_plan(task, context)
+        # The summarizer spends an LLM call, so it only ever runs for real
+        speculative_order = [agent_id for agent_id in predicted.execution_order if agent_id != "summarizer"]
+        if predicted.clarification_needed or not speculative_order:
+            return await self._plan_task(task, context), None
+        
+        # Separate agent instances: cancelling only stops the coroutine, and worker threads it handed off
+        # keep writing status and context to whichever agents they were given
+        speculative_agents = agents.spawn()
+        speculative_plan = replace(
+            predicted,
+            agents_needed=[agent_id for agent_id in predicted.agents_needed if agent_id != "summarizer"],
+            execution_order=speculative_order
+        )
+        speculative = asyncio.create_task(self._execute_plan(speculative_plan, agents=speculative_agents))
+        try:
+            task_plan = await self._plan_task(task, context)
+        except BaseException:
+            speculative.cancel()
+            raise
+        
+        if not task_plan.clarification_needed and task_plan.execution_order == predicted.execution_order:
+            finished = await speculative
+            # The speculative agents hold the contexts the remaining agents build on
+            agents.adopt(speculative_agents.instances())
+            return task_plan, finished
+        
+        # Misprediction: anything still running only touches the discarded instances
+        speculative.cancel()
+        return task_plan, None
+    
+    async def _plan_task(self, task: str, context: Dict[str, Any]) -> TaskPlan:
+        """Use LLM to plan which agents are needed and in what order"""
+        try:
+            # Queue the task so concurrent requests are planned together in one call
+            loop = asyncio.get_running_loop()
+            if self._plan_batch_worker is None or self._plan_batch_worker.done() or self._plan_batch_worker.get_loop() is not loop:
+                self._plan_batch_queue = asyncio.Queue()
+                self._plan_batch_worker = loop.create_task(self._run_plan_batches(self._plan_batch_queue))
+            
+            future = loop.create_future()
+            await self._plan_batch_queue.put((task, context, future))
+            return await future
+            
+        except Exception as e:
+            self.logger.error(f"Error in task planning: {str(e)}")
+            # Fallback to basic planning
+            return self._create_fallback_plan(task, context)
+    
+    async def _run_plan_batches(self, queue: asyncio.Queue):
+        """Collect pending planning requests and plan each batch with a single LLM call"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + PLAN_BATCH_WINDOW
+            while len(batch) < PLAN_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                plans = await self._plan_batch([(task, context) for task, context, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, _, future), plan in zip(batch, plans):
+                if not future.done():
+                    future.set_result(plan)
+    
+    async def _plan_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> List[TaskPlan]:
+        """Plan one or more tasks, sending several tasks as a single tagged prompt"""
+        # Get available agents and their capabilities
+        agent_capabilities = self._get_agent_capabilities()
+        
+        if len(batch) == 1:
+            task, context = batch[0]
+            planning_prompt = self._create_planning_prompt(task, context)
+            plan_response = await self._call_llm_for_planning(planning_prompt, self._planning_prompt_static)
+            return [self._parse_planning_response(task, plan_response, context)]
+        
+        planning_prompt = self._create_batch_planning_prompt(batch, agent_capabilities)
+        plan_response = await self._call_llm_for_planning(planning_prompt)
+        
+        # Demultiplex the plans by id; tasks the response left out get the keyword-based plan
+        try:
+            plan_items = orjson.loads(plan_response).get("plans", [])
+        except (orjson.JSONDecodeError, AttributeError) as e:
+            self.logger.error(f"Error parsing batch planning response: {str(e)}")
+            plan_items = []
+        plans_by_id = {item.get("id"): item for item in plan_items if isinstance(item, dict)}
+        
+        return [
+            self._build_task_plan(task, plans_by_id[index], context) if index in plans_by_id
+            else self._create_fallback_plan(task, context)
+            for index, (task, context) in enumerate(batch)
+        ]
+    
+    def _get_agent_capabilities(self) -> Dict[str, List[str]]:
+        """Get capabilities of all available agents"""
+        return self._capabilities_cache
+    
+    def _create_planning_prompt(self, task: str, context: Dict) -> str:
+        """Create the user message for task planning; only the request and context vary between calls"""
+        context_json = orjson.dumps(context, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str).decode()
+        return f'User Request: "{task}"\nContext: {context_json}'
+    
+    def _build_static_planning_prefix(self) -> str:
+        """Build the planning system message, identical for every request so the provider caches it"""
+        prompt = PLANNING_SYSTEM_PROMPT + """
+        
+        You are a task orchestrator for a multi-agent financial analysis system. 
+        Analyze the user's request and determine which agents should be used and in what order.
+        
+        Available Agents and Capabilities:
+        """
+        
+        for agent_id, capabilities in sorted(self._get_agent_capabilities().items()):
+            prompt += f"\n- {agent_id}: {', '.join(capabilities)}"
+        
+        prompt += """
+        
+        IMPORTANT: If clarification_answers are provided in the context, use them to understand what the user wants and DO NOT ask for clarification again.
+        
+        CLARIFICATION RULES:
+        - Ask for clarification if the request is vague or ambiguous (e.g., "analyze data", "show trends", "help me")
+        - Ask for clarification if time period is not specified (e.g., "analyze profit" should ask "What time period?")
+        - Ask for clarification if scope is unclear (e.g., "compare performance" should ask "Compare what?")
+        - Ask for clarification if output format is not specified (e.g., "show me data" should ask "Do you want charts, tables, or reports?")
+        
+        Please respond with a JSON object containing:
+        1. "agents_needed": List of agent IDs that should be used
+        2. "execution_order": List of agent IDs in execution order
+        3. "clarification_needed": Boolean indicating if clarification is needed (should be false if clarification_answers exist)
+        4. "clarification_questions": List of questions if clarification is needed
+        5. "dependencies": Object mapping each agent ID to the agent IDs whose output it needs; agents whose dependencies are met run in parallel
+        6. "reasoning": Brief explanation of the plan
+        
+        Example response for ambiguous request:
+        {
+            "agents_needed": [],
+            "execution_order": [],
+            "clarification_needed": true,
+            "clarification_questions": ["What specific data would you like me to analyze?", "What time period are you interested in?", "What type of analysis do you need?"],
+            "dependencies": {},
+            "reasoning": "Request is too vague, need clarification on scope and requirements"
+        }
+        
+        Example response for clear request:
+        {
+            "agents_needed": ["data_fetcher", "analyzer", "visualizer", "summarizer"],
+            "execution_order": ["data_fetcher", "analyzer", "visualizer", "summarizer"],
+            "clarification_needed": false,
+            "clarification_questions": [],
+            "dependencies": {"data_fetcher": [], "analyzer": ["data_fetcher"], "visualizer": ["data_fetcher", "analyzer"], "summarizer": ["data_fetcher", "analyzer"]},
+            "reasoning": "Need to fetch data, analyze it, create visualizations, and summarize results"
+        }
+        """
+        
+        return prompt
+    
+    def _create_batch_planning_prompt(self, batch: List[Tuple[str, Dict[str, Any]]], agent_capabilities: Dict) -> str:
+        """Create one prompt that plans several tagged tasks at once"""
+        tasks = [{"id": index, "task": task, "context": context} for index, (task, context) in enumerate(batch)]
+        
+        prompt = f"""
+        You are a task orchestrator for a multi-agent financial analysis system. 
+        Plan each of these {len(tasks)} user requests independently and determine which agents should be used and in what order.
+        
+        Tasks: {orjson.dumps(tasks, default=str).decode()}
+        
+        Available Agents and Capabilities:
+        """
+        
+        for agent_id, capabilities in agent_capabilities.items():
+            prompt += f"\n- {agent_id}: {', '.join(capabilities)}"
+        
+        prompt += """
+        
+        Apply the same rules as for a single request: ask for clarification when a request is vague, lacks a
+        time period, scope or output format, unless its context contains clarification_answers.
+        
+        Please respond with a JSON object {"plans": [...]} holding one plan per task, each containing:
+        "id" (the task id), "agents_needed", "execution_order", "clarification_needed",
+        "clarification_questions", "dependencies" and "reasoning".
+        """
+        
+        return prompt
+    
+    async def _call_llm_for_planning(self, prompt: str, system_prompt: str = PLANNING_SYSTEM_PROMPT) -> str:
+        """Call ChatGPT-4 for task planning"""
+        try:
+            messages = [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+            
+            # Identical planning requests reuse the earlier completion
+            cache_key = llm_client.cache_key(OPENAI_MODEL, 0.1, messages)
+            cached = llm_client.get_cached(cache_key)
+            if cached is not None:
+                return cached
+            
+            client = llm_client.get_client()
+            
+            response = await client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=messages,
+                max_tokens=1000,
+                temperature=0.1,
+                response_format={"type": "json_object"}
+            )
+            
+            content = response.choices[0].message.content
+            llm_client.store(cache_key, content)
+            return content
+            
+        except Exception as e:
+            self.logger.error(f"Error calling LLM for planning: {str(e)}")
+            raise
+    
+    def _parse_planning_response(self, task: str, response: str, context: Dict) -> TaskPlan:
+        """Parse LLM response to create task plan"""
+        try:
+            # JSON mode guarantees a bare object, so no markdown fences to strip
+            plan_data = orjson.loads(response)
+            
+            return self._build_task_plan(task, plan_data, context)
+            
+        except (orjson.JSONDecodeError, KeyError) as e:
+            self.logger.error(f"Error parsing planning response: {str(e)}")
+            
+            return self._create_fallback_plan(task, context)
+    
+    def _build_task_plan(self, task: str, plan_data: Dict[str, Any], context: Dict) -> TaskPlan:
+        """Create a task plan from one decoded planning object"""
+        dependencies = plan_data.get("dependencies")
+        if isinstance(dependencies, dict):
+            dependencies = {str(k): v for k, v in dependencies.items() if isinstance(v, list)}
+        else:
+            dependencies = None
+        
+        return TaskPlan(
+            task=task,
+            agents_needed=plan_data.get("agents_needed", []),
+            execution_order=plan_data.get("execution_order", []),
+            context=context,
+            clarification_needed=plan_data.get("clarification_needed", False),
+            clarification_questions=plan_data.get("clarification_questions", []),
+            dependencies=dependencies
+        )
+    
+    def _match_agents(self, task_lower: str) -> List[str]:
+        """Agents whose keywords appear in the task, in pipeline order"""
+        matched = {AGENT_KEYWORD_IDS[match.group()] for match in AGENT_KEYWORD_PATTERN.finditer(task_lower)}
+        return [agent_id for agent_id, _ in AGENT_KEYWORDS if agent_id in matched]
+    
+    def _is_vague(self, task: str) -> bool:
+        """Whether the request is too vague to plan without clarification"""
+        return VAGUE_PATTERN.search(task.lower()) is not None or len(task.split()) <= 3
+    
+    def _create_standard_plan(self, task: str, context: Dict) -> Optional[TaskPlan]:
+        """Plan the full pipeline directly when the task asks for every stage, else None"""
+        if self._match_agents(task.lower()) != DEFAULT_PIPELINE:
+            return None
+        # Vague, unanswered requests still go to the planner, which may ask for clarification
+        if not context.get("clarification_answers") and self._is_vague(task):
+            return None
+        
+        return TaskPlan(
+            task=task,
+            agents_needed=list(DEFAULT_PIPELINE),
+            execution_order=list(DEFAULT_PIPELINE),
+            context=context,
+            clarification_needed=False
+        )
+    
+    def _create_fallback_plan(self, task: str, context: Dict) -> TaskPlan:
+        """Create a basic fallback plan when LLM planning fails"""
+        
+        clarification_needed = not bool(context.get("clarification_answers"))
+        
+        
+        if clarification_needed and self._is_vague(task):
+            clarification_questions = [
+                "What specific financial data would you like me to analyze?",
+                "What time period are you interested in? (e.g., last quarter, last year)",
+                "What type of analysis do you need? (e.g., trends, comparisons, summaries)",
+                "Do you want charts, tables, or reports?"
+            ]
+            
+            return TaskPlan(
+                task=task,
+                agents_needed=[],
+                execution_order=[],
+                context=context,
+                clarification_needed=True,
+                clarification_questions=clarification_questions
+            )
+        
+        
+        agents_needed = self._match_agents(task.lower())
+        
+        
+        if not agents_needed:
+            agents_needed = list(DEFAULT_PIPELINE)
+        
+        return TaskPlan(
+            task=task,
+            agents_needed=agents_needed,
+            execution_order=agents_needed,
+            context=context,
+            clarification_needed=False
+        )
+    
+    async def _execute_plan(self, task_plan: TaskPlan, batch: bool = False,
+                            finished: Optional[Dict[str, AgentResult]] = None,
+                            agents: Optional[Mapping[str, BaseAgent]] = None) -> Dict[str, AgentResult]:
+        """Execute the planned tasks, starting each agent as soon as the agents it waits for have finished;
+        agents with a result in finished are not run again"""
+        agents = self.agents if agents is None else agents
+        execution_results = dict(finished or {})
+        # Each finished agent's context is layered in front without copying what came before
+        shared_context = ChainMap(dict(task_plan.context))
+        for agent_id in execution_results:
+            shared_context = shared_context.new_child(agents[agent_id].context)
+        waits = task_plan.execution_dependencies()
+        
+        async def run(agent_id: str, prerequisites: List[asyncio.Task]):
+            nonlocal shared_context
+            if prerequisites:
+                await asyncio.wait(prerequisites)
+            
+            self.logger.info(f"Executing agent: {agent_id}")
+            try:
+                # An empty front map keeps the agent's writes away from agents still running
+                result = await self._run_agent(agents[agent_id], task_plan.task, shared_context.new_child(), batch)
+            except Exception as e:
+                self.logger.error(f"Error executing agent {agent_id}: {str(e)}")
+                execution_results[agent_id] = AgentResult(
+                    agent_id=agent_id,
+                    status=AgentStatus.ERROR,
+                    data=None,
+                    error=str(e)
+                )
+                return
+            
+            execution_results[agent_id] = result
+            shared_context = shared_context.new_child(agents[agent_id].context)
+            
+            if result.status == AgentStatus.ERROR:
+                self.logger.error(f"Agent {agent_id} failed: {result.error}")
+        
+        # No barrier between layers: an agent only waits on its own prerequisites
+        running: Dict[str, asyncio.Task] = {}
+        scheduled = []
+        for layer in task_plan.execution_layers():
+            for agent_id in layer:
+                if agent_id not in agents:
+                    self.logger.warning(f"Agent {agent_id} not found, skipping")
+                    continue
+                scheduled.append(agent_id)
+                if agent_id in execution_results:
+                    continue
+                prerequisites = [running[dep] for dep in waits[agent_id] if dep in running]
+                running[agent_id] = asyncio.create_task(run(agent_id, prerequisites))
+        
+        await asyncio.gather(*running.values())
+        
+        # Report in plan order rather than completion order
+        return {agent_id: execution_results[agent_id] for agent_id in scheduled}
+    
+    def _run_agent(self, agent: BaseAgent, task: str, context: ChainMap, batch: bool):
+        """Start an agent's execution; only the summarizer takes the batch flag"""
+        if agent.agent_id == "summarizer":
+            return agent.execute(task, context, batch=batch)
+        return agent.execute(task, context)
+    
+    async def _aggregate_results(self, execution_results: Dict[str, AgentResult], task_plan: TaskPlan) -> Dict[str, Any]:
+        """Aggregate results from all agents into final response"""
+        successful_agents, failed_agents, agent_status = [], [], {}
+        
+        # Result field filled by each agent's data, with its default when the agent produced nothing
+        sections = {"summary": None, "analysis": {}, "visualizations": {}, "financial_data": {}}
+        
+        # One pass over the results sorts agents by outcome and picks up their data
+        for agent_id, result in execution_results.items():
+            agent_status[agent_id] = result.status.value
+            if result.status == AgentStatus.COMPLETED:
+                successful_agents.append(agent_id)
+                if result.data and agent_id in RESULT_SECTIONS:
+                    sections[RESULT_SECTIONS[agent_id]] = result.data
+            elif result.status == AgentStatus.ERROR:
+                failed_agents.append(agent_id)
+        
+        return {
+            "status": "completed",
+            "task": task_plan.task,
+            **sections,
+            "successful_agents": successful_agents,
+            "failed_agents": failed_agents,
+            "agent_status": agent_status,
+            "metadata": {
+                "total_agents": len(execution_results),
+                "successful_agents": len(successful_agents),
+                "failed_agents": len(failed_agents)
+            }
+        }
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get current orchestrator status"""
+        return {
+            "status": self.status.value,
+            "current_task": self.current_task,
+            "available_agents": list(self.agents.keys()),
+            "agent_status": self._agent_status()
+        }
+    
+    def _agent_status(self) -> Dict[str, str]:
+        """Status of every registered agent; ones not constructed yet have done nothing and are idle"""
+        agent_status = {agent_id: AgentStatus.IDLE.value for agent_id in self.agents}
+        agent_status.update({agent_id: agent.status.value for agent_id, agent in self.agents.instances().items()})
+        return agent_status
+    
+    def get_agent_info(self) -> Dict[str, Dict[str, Any]]:
+        """Role, description and capabilities of every registered agent, read without constructing any"""
+        return {
+            agent_id: {
+                "role": AGENT_MODULES[agent_id].ROLE,
+                "description": AGENT_MODULES[agent_id].DESCRIPTION,
+                "capabilities": list(AGENT_MODULES[agent_id].CAPABILITIES)
+            }
+            for agent_id in self.agents
+        }
+    
+    async def handle_clarification(self, clarification_answers: Dict[str, str], task: Optional[str] = None) -> Dict[str, Any]:
+        """Handle user clarification responses; task defaults to the request awaiting clarification"""
+        if task is None:
+            if self.status != TaskStatus.WAITING_FOR_CLARIFICATION:
+                return {"error": "No clarification needed at this time"}
+            task = self.current_task
+        
+        
+        updated_context = {"clarification_answers": clarification_answers}
+        
+        
+        self.status = TaskStatus.PLANNING
+        
+        
+        return await self.process_request(task, updated_context)
@@ -1,353 +1,467 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
-import numpy as np
-from typing import Dict, Any, List, Optional
-from .base_agent import BaseAgent, AgentStatus, AgentResult
-import logging
-import io
-import base64
-
-class VisualizerAgent(BaseAgent):
-    def __init__(self):
-        super().__init__(
-            agent_id="visualizer",
-            role="Data Visualizer",
-            description="Creates charts and visualizations from financial data"
-        )
-        
-    def can_handle(self, task: str) -> bool:
-        """Check if task involves visualization"""
-        keywords = ["chart", "graph", "plot", "visualize", "visualization", "trend", "show"]
-        return any(keyword in task.lower() for keyword in keywords)
-        
-    def get_capabilities(self) -> List[str]:
-        return [
-            "Create price charts",
-            "Generate trend visualizations",
-            "Plot quarterly comparisons",
-            "Create volume charts",
-            "Generate performance dashboards"
-        ]
-        
-    async def execute(self, task: str, context: Dict[str, Any] = None) -> AgentResult:
-        """Create visualizations based on task requirements"""
-        try:
-            self.update_status(AgentStatus.WORKING)
-            
-            # Get data from context (try both shared context and agent context)
-            financial_data = self.get_from_context("financial_data")
-            analysis_results = self.get_from_context("analysis_results")
-            
-            if not financial_data and context:
-                financial_data = context.get("financial_data")
-                analysis_results = context.get("analysis_results")
-            
-            if not financial_data:
-                raise ValueError("No financial data available for visualization")
-            
-            # Convert to DataFrame
-            hist_data = pd.DataFrame(financial_data["raw_data"])
-            if hist_data.empty:
-                raise ValueError("No data available for visualization")
-            
-            # Convert date column if it exists
-            if 'Date' in hist_data.columns:
-                hist_data['Date'] = pd.to_datetime(hist_data['Date'])
-                hist_data.set_index('Date', inplace=True)
-            # If no date column, just use the data as is
-            
-            # Create visualizations based on task
-            visualizations = {}
-            
-            if "chart" in task.lower() or "plot" in task.lower():
-                visualizations.update(self._create_price_chart(hist_data, task))
-            
-            if "quarter" in task.lower():
-                visualizations.update(self._create_quarterly_chart(hist_data, task))
-            
-            if "volume" in task.lower():
-                visualizations.update(self._create_volume_chart(hist_data, task))
-            
-            if "trend" in task.lower():
-                visualizations.update(self._create_trend_chart(hist_data, analysis_results, task))
-            
-            # Always create a basic price chart if no specific chart requested
-            if not visualizations:
-                visualizations.update(self._create_price_chart(hist_data, task))
-            
-            # Store visualizations in context
-            self.add_to_context("visualizations", visualizations)
-            
-            self.update_status(AgentStatus.COMPLETED)
-            self.store_result(visualizations)
-            
-            return AgentResult(
-                agent_id=self.agent_id,
-                status=AgentStatus.COMPLETED,
-                data=visualizations,
-                metadata={"charts_created": len(visualizations)}
-            )
-            
-        except Exception as e:
-            self.logger.error(f"Error creating visualizations: {str(e)}")
-            self.update_status(AgentStatus.ERROR)
-            return AgentResult(
-                agent_id=self.agent_id,
-                status=AgentStatus.ERROR,
-                data=None,
-                error=str(e)
-            )
-    
-    def _create_price_chart(self, df: pd.DataFrame, task: str) -> Dict[str, Any]:
-        """Create profit trend chart"""
-        if 'Profit' not in df.columns:
-            return {}
-        
-        # Create Plotly figure
-        fig = go.Figure()
-        
-        # Group by date to get daily profit totals
-        if 'Date' in df.columns:
-            daily_profit = df.groupby('Date')['Profit'].sum().sort_index()
-            
-            # Add profit line
-            fig.add_trace(go.Scatter(
-                x=daily_profit.index,
-                y=daily_profit.values,
-                mode='lines+markers',
-                name='Daily Profit',
-                line=dict(color='blue', width=2)
-            ))
-            
-            # Add moving average if requested
-            if "moving" in task.lower() or "average" in task.lower():
-                ma_7 = daily_profit.rolling(window=7).mean()
-                fig.add_trace(go.Scatter(
-                    x=daily_profit.index,
-                    y=ma_7.values,
-                    mode='lines',
-                    name='7-Day Average',
-                    line=dict(color='orange', width=1, dash='dash')
-                ))
-            
-            # Update layout
-            fig.update_layout(
-                title=f"Profit Trend Chart - {daily_profit.index[0].strftime('%Y-%m-%d')} to {daily_profit.index[-1].strftime('%Y-%m-%d')}",
-                xaxis_title="Date",
-                yaxis_title="Profit ($)",
-                hovermode='x unified',
-                template="plotly_white"
-            )
-        else:
-            # Simple bar chart if no date column
-            fig.add_trace(go.Bar(
-                x=list(range(len(df))),
-                y=df['Profit'],
-                name='Profit',
-                marker_color='blue'
-            ))
-            
-            fig.update_layout(
-                title="Profit Chart",
-                xaxis_title="Record",
-                yaxis_title="Profit ($)",
-                template="plotly_white"
-            )
-        
-        # Convert to base64 for storage
-        chart_html = fig.to_html(include_plotlyjs='cdn')
-        chart_base64 = base64.b64encode(chart_html.encode()).decode()
-        
-        return {
-            "profit_chart": {
-                "type": "plotly",
-                "data": chart_base64,
-                "title": "Profit Trend Chart"
-            }
-        }
-    
-    def _create_quarterly_chart(self, df: pd.DataFrame, task: str) -> Dict[str, Any]:
-        """Create quarterly performance chart"""
-        if 'Profit' not in df.columns or 'Date' not in df.columns:
-            return {}
-        
-        # Set date as index and group by quarters
-        df_with_date = df.copy()
-        df_with_date['Date'] = pd.to_datetime(df_with_date['Date'])
-        df_with_date.set_index('Date', inplace=True)
-        
-        # Group by quarters
-        quarterly_data = df_with_date.resample('Q').agg({
-            'Profit': 'sum',
-            'Gross Sales': 'sum',
-            'Units Sold': 'sum'
-        }).dropna()
-        
-        if len(quarterly_data) < 2:
-            return {"quarterly_chart": "Insufficient data for quarterly chart"}
-        
-        # Calculate quarterly profit changes
-        quarterly_profit_changes = quarterly_data['Profit'].pct_change().dropna() * 100
-        
-        # Create bar chart
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=[q.strftime('%Y-Q%q') for q in quarterly_profit_changes.index],
-            y=quarterly_profit_changes.values,
-            name='Quarterly Profit Change (%)',
-            marker_color=['green' if x > 0 else 'red' for x in quarterly_profit_changes.values]
-        ))
-        
-        fig.update_layout(
-            title="Quarterly Profit Changes",
-            xaxis_title="Quarter",
-            yaxis_title="Profit Change (%)",
-            template="plotly_white"
-        )
-        
-        chart_html = fig.to_html(include_plotlyjs='cdn')
-        chart_base64 = base64.b64encode(chart_html.encode()).decode()
-        
-        return {
-            "quarterly_chart": {
-                "type": "plotly",
-                "data": chart_base64,
-                "title": "Quarterly Profit Changes"
-            }
-        }
-    
-    def _create_volume_chart(self, df: pd.DataFrame, task: str) -> Dict[str, Any]:
-        """Create units sold chart"""
-        if 'Units Sold' not in df.columns:
-            return {}
-        
-        # Create subplot with profit and units sold
-        fig = make_subplots(
-            rows=2, cols=1,
-            shared_xaxes=True,
-            vertical_spacing=0.1,
-            subplot_titles=('Profit', 'Units Sold'),
-            row_heights=[0.7, 0.3]
-        )
-        
-        # Profit chart
-        if 'Date' in df.columns:
-            daily_profit = df.groupby('Date')['Profit'].sum().sort_index()
-            fig.add_trace(go.Scatter(
-                x=daily_profit.index,
-                y=daily_profit.values,
-                mode='lines',
-                name='Daily Profit',
-                line=dict(color='blue')
-            ), row=1, col=1)
-        else:
-            fig.add_trace(go.Scatter(
-                x=list(range(len(df))),
-                y=df['Profit'],
-                mode='lines',
-                name='Profit',
-                line=dict(color='blue')
-            ), row=1, col=1)
-        
-        # Units sold chart
-        if 'Date' in df.columns:
-            daily_units = df.groupby('Date')['Units Sold'].sum().sort_index()
-            fig.add_trace(go.Bar(
-                x=daily_units.index,
-                y=daily_units.values,
-                name='Daily Units Sold',
-                marker_color='lightblue'
-            ), row=2, col=1)
-        else:
-            fig.add_trace(go.Bar(
-                x=list(range(len(df))),
-                y=df['Units Sold'],
-                name='Units Sold',
-                marker_color='lightblue'
-            ), row=2, col=1)
-        
-        fig.update_layout(
-            title="Profit and Units Sold Chart",
-            template="plotly_white",
-            height=600
-        )
-        
-        chart_html = fig.to_html(include_plotlyjs='cdn')
-        chart_base64 = base64.b64encode(chart_html.encode()).decode()
-        
-        return {
-            "units_chart": {
-                "type": "plotly",
-                "data": chart_base64,
-                "title": "Profit and Units Sold Chart"
-            }
-        }
-    
-    def _create_trend_chart(self, df: pd.DataFrame, analysis_results: Dict, task: str) -> Dict[str, Any]:
-        """Create trend analysis chart"""
-        if 'Profit' not in df.columns:
-            return {}
-        
-        # Create profit trend chart
-        fig = go.Figure()
-        
-        if 'Date' in df.columns:
-            daily_profit = df.groupby('Date')['Profit'].sum().sort_index()
-            
-            # Add profit line
-            fig.add_trace(go.Scatter(
-                x=daily_profit.index,
-                y=daily_profit.values,
-                mode='lines+markers',
-                name='Daily Profit',
-                line=dict(color='blue', width=2)
-            ))
-            
-            # Add trend line if we have moving averages
-            if analysis_results.get('avg_daily_profit'):
-                ma_7 = daily_profit.rolling(window=7).mean()
-                fig.add_trace(go.Scatter(
-                    x=daily_profit.index,
-                    y=ma_7.values,
-                    mode='lines',
-                    name='7-Day Average',
-                    line=dict(color='orange', dash='dash')
-                ))
-            
-            fig.update_layout(
-                title="Profit Trend Analysis",
-                xaxis_title="Date",
-                yaxis_title="Profit ($)",
-                template="plotly_white"
-            )
-        else:
-            # Simple bar chart if no date column
-            fig.add_trace(go.Bar(
-                x=list(range(len(df))),
-                y=df['Profit'],
-                name='Profit',
-                marker_color='blue'
-            ))
-            
-            fig.update_layout(
-                title="Profit Trend Analysis",
-                xaxis_title="Record",
-                yaxis_title="Profit ($)",
-                template="plotly_white"
-            )
-        
-        chart_html = fig.to_html(include_plotlyjs='cdn')
-        chart_base64 = base64.b64encode(chart_html.encode()).decode()
-        
-        return {
-            "trend_chart": {
-                "type": "plotly",
-                "data": chart_base64,
-                "title": "Profit Trend Analysis"
-            }
-        }
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, FrozenSet, List, Optional
+from .base_agent import BaseAgent, AgentStatus, AgentResult
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+
+CAN_HANDLE_KEYWORDS = frozenset({"chart", "graph", "plot", "visualize", "visualization", "trend", "show"})
+CAN_HANDLE_PATTERN = re.compile("|".join(sorted(CAN_HANDLE_KEYWORDS)))
+ROLE = "Data Visualizer"
+DESCRIPTION = "Creates charts and visualizations from financial data"
+CAPABILITIES = (
+    "Create price charts",
+    "Generate trend visualizations",
+    "Plot quarterly comparisons",
+    "Create volume charts",
+    "Generate performance dashboards",
+)
+
+# Task keywords that select charts; the lookahead reports overlapping matches so this equals per-keyword `in` checks
+CHART_KEYWORDS = ("chart", "plot", "quarter", "volume", "trend", "moving", "average")
+CHART_KEYWORD_PATTERN = re.compile("(?=(" + "|".join(CHART_KEYWORDS) + "))")
+
+# Line traces switch to WebGL above this many points; SVG paths get slow to draw in the browser
+WEBGL_POINT_THRESHOLD = 1000
+
+def _scatter_type(points: int):
+    """Scatter trace class for a line with the given number of points"""
+    return go.Scattergl if points > WEBGL_POINT_THRESHOLD else go.Scatter
+
+# Layout settings shared by every chart
+CHART_LAYOUT = dict(template="plotly_white")
+
+# Plotted value columns, narrowed to float32 when that is lossless so grouped sums and figure arrays halve
+CHART_VALUE_COLUMNS = ('Profit', 'Gross Sales', 'Units Sold')
+
+# Rendered chart payloads reused across calls, keyed by chart selection and data content
+CHART_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+CHART_CACHE_SIZE = 32
+CHART_CACHE_MAX_CELLS = 10_000_000
+
+# Parsed frames kept per agent, keyed by payload identity, so re-rendering a payload skips the rebuild
+DF_CACHE_SIZE = 4
+
+# Days in the moving average drawn over daily profit
+MOVING_AVERAGE_WINDOW = 7
+
+def _rolling_mean_loop(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean with a running sum, NaN until the window fills"""
+    out = np.empty(values.shape[0])
+    out[:] = np.nan
+    total = 0.0
+    for i in range(values.shape[0]):
+        total += values[i]
+        if i >= window:
+            total -= values[i - window]
+        if i >= window - 1:
+            out[i] = total / window
+    return out
+
+def _rolling_mean_cumsum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean from a cumulative sum, NaN until the window fills"""
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        csum = np.cumsum(np.concatenate(([0.0], values)))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+# numba is optional: with it the running-sum loop is compiled, otherwise the vectorised cumsum form is used
+try:
+    from numba import njit
+except ImportError:
+    _rolling_mean = _rolling_mean_cumsum
+else:
+    try:
+        _rolling_mean = njit(cache=True)(_rolling_mean_loop)
+        # Compile at import so the first chart does not pay the JIT
+        _rolling_mean(np.zeros(1), 1)
+    except Exception as e:
+        # A failed compile (e.g. a read-only cache directory) must not take the agent package down with it
+        logging.getLogger(__name__).warning("numba rolling mean unavailable, using cumsum: %s", e)
+        _rolling_mean = _rolling_mean_cumsum
+
+def rolling_mean(values: np.ndarray, window: int = MOVING_AVERAGE_WINDOW) -> np.ndarray:
+    """Same result as Series.rolling(window).mean() for gap-free data, without building a Rolling object"""
+    return _rolling_mean(np.ascontiguousarray(values, dtype=np.float64), window)
+
+class VisualizerAgent(BaseAgent):
+    def __init__(self):
+        super().__init__(
+            agent_id="visualizer",
+            role=ROLE,
+            description=DESCRIPTION
+        )
+        self._df_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        
+    def can_handle(self, task: str) -> bool:
+        """Check if task involves visualization"""
+        return CAN_HANDLE_PATTERN.search(task.lower()) is not None
+        
+    def get_capabilities(self) -> List[str]:
+        return list(CAPABILITIES)
+        
+    async def execute(self, task: str, context: Dict[str, Any] = None) -> AgentResult:
+        """Create visualizations based on task requirements"""
+        try:
+            self.update_status(AgentStatus.WORKING)
+            
+            # Get data from context (try both shared context and agent context)
+            financial_data = self.get_from_context("financial_data")
+            analysis_results = self.get_from_context("analysis_results")
+            
+            if not financial_data and context:
+                financial_data = context.get("financial_data")
+                analysis_results = context.get("analysis_results")
+            
+            if not financial_data:
+                raise ValueError("No financial data available for visualization")
+            
+            # Convert to DataFrame, dates parsed and indexed once for every chart
+            hist_data = self._get_dataframe(financial_data)
+            if hist_data.empty:
+                raise ValueError("No data available for visualization")
+            
+            # Charts depend only on the data, the chart keywords and whether an average is available
+            keywords = frozenset(CHART_KEYWORD_PATTERN.findall(task.lower()))
+            cache_key = self._chart_cache_key(hist_data, keywords, analysis_results)
+            
+            if cache_key is not None and cache_key in CHART_CACHE:
+                CHART_CACHE.move_to_end(cache_key)
+                visualizations = dict(CHART_CACHE[cache_key])
+            else:
+                visualizations = await self._create_charts(hist_data, task, keywords, analysis_results)
+                if cache_key is not None:
+                    CHART_CACHE[cache_key] = dict(visualizations)
+                    if len(CHART_CACHE) > CHART_CACHE_SIZE:
+                        CHART_CACHE.popitem(last=False)
+            
+            # Store visualizations in context
+            self.add_to_context("visualizations", visualizations)
+            
+            self.update_status(AgentStatus.COMPLETED)
+            self.store_result(visualizations)
+            
+            return AgentResult(
+                agent_id=self.agent_id,
+                status=AgentStatus.COMPLETED,
+                data=visualizations,
+                metadata={"charts_created": len(visualizations)}
+            )
+            
+        except Exception as e:
+            self.logger.error(f"Error creating visualizations: {str(e)}")
+            self.update_status(AgentStatus.ERROR)
+            return AgentResult(
+                agent_id=self.agent_id,
+                status=AgentStatus.ERROR,
+                data=None,
+                error=str(e)
+            )
+    
+    async def _create_charts(self, hist_data: pd.DataFrame, task: str, keywords: FrozenSet[str], analysis_results: Dict) -> Dict[str, Any]:
+        """Build the charts selected by the task keywords"""
+        # A single record cannot make a line or a comparison, so skip plotly entirely
+        if len(hist_data) < 2:
+            return {"profit_chart": self._empty_chart("Profit Trend Chart", "Not enough data points to plot")}
+        
+        # Daily totals shared by the profit, units and trend charts, grouped once over just those columns
+        daily = None
+        if 'Date' in hist_data.columns:
+            daily_columns = [col for col in ('Profit', 'Units Sold') if col in hist_data.columns]
+            daily = hist_data[daily_columns].groupby(level=0).sum()
+        
+        # Pick the charts based on task, in the order they appear in the result
+        jobs = []
+        
+        if "chart" in keywords or "plot" in keywords:
+            jobs.append((self._create_price_chart, (hist_data, task, daily, keywords)))
+        
+        if "quarter" in keywords:
+            jobs.append((self._create_quarterly_chart, (hist_data, task)))
+        
+        if "volume" in keywords:
+            jobs.append((self._create_volume_chart, (hist_data, task, daily)))
+        
+        if "trend" in keywords:
+            jobs.append((self._create_trend_chart, (hist_data, analysis_results, task, daily)))
+        
+        # The helpers only read the shared frames, so several charts can render on worker threads at once
+        if len(jobs) > 1:
+            results = await asyncio.gather(*(asyncio.to_thread(helper, *args) for helper, args in jobs))
+        else:
+            results = [helper(*args) for helper, args in jobs]
+        
+        visualizations = {}
+        for charts in results:
+            visualizations.update(charts)
+        
+        # Always create a basic price chart if no specific chart requested
+        if not visualizations:
+            visualizations.update(self._create_price_chart(hist_data, task, daily, keywords))
+        
+        return visualizations
+    
+    def _chart_cache_key(self, df: pd.DataFrame, keywords: FrozenSet[str], analysis_results: Optional[Dict]) -> Optional[tuple]:
+        """Content key for memoized charts, or None when the frame is too large to cache"""
+        if df.size > CHART_CACHE_MAX_CELLS:
+            return None
+        data_hash = hash(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        has_average = bool((analysis_results or {}).get('avg_daily_profit'))
+        return (keywords, has_average, data_hash)
+    
+    def _get_dataframe(self, financial_data: Dict[str, Any]) -> pd.DataFrame:
+        """Return the chart frame for raw_data, reusing it when the same payload is visualized again"""
+        raw = financial_data["raw_data"]
+        key = (id(raw), len(raw))
+        
+        cached = self._df_cache.get(key)
+        # The identity check guards against a recycled id() of a freed payload
+        if cached is not None and cached[0] is raw:
+            self._df_cache.move_to_end(key)
+            return cached[1]
+        
+        df = self._build_df(raw)
+        self._df_cache[key] = (raw, df)
+        if len(self._df_cache) > DF_CACHE_SIZE:
+            self._df_cache.popitem(last=False)
+        return df
+    
+    def _build_df(self, raw: Any) -> pd.DataFrame:
+        """Build the chart frame; a Date column becomes the index and is kept as a column"""
+        df = pd.DataFrame(raw, copy=False) if isinstance(raw, dict) else pd.DataFrame(raw)
+        for col in CHART_VALUE_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], downcast='float')
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'])
+            df = df.set_index('Date', drop=False)
+        return df
+    
+    def _empty_chart(self, title: str, reason: str) -> Dict[str, Any]:
+        """Lightweight placeholder for a chart that would hold fewer than two points"""
+        return {"type": "empty", "title": title, "reason": reason}
+    
+    def _figure_payload(self, fig: go.Figure, title: str) -> Dict[str, Any]:
+        """Serialize a figure and drop its traces so they don't wait on the cyclic GC"""
+        payload = {"type": "plotly", "figure": fig.to_plotly_json(), "title": title}
+        # to_plotly_json returns copies; the figure's parent/child references form a
+        # cycle, so clearing it frees the trace arrays now instead of at the next collection
+        fig.data = ()
+        fig.layout = {}
+        return payload
+    
+    def _create_price_chart(self, df: pd.DataFrame, task: str, daily: Optional[pd.DataFrame] = None, keywords: FrozenSet[str] = frozenset()) -> Dict[str, Any]:
+        """Create profit trend chart"""
+        if 'Profit' not in df.columns:
+            return {}
+        
+        # Daily profit totals when the data is dated
+        if daily is not None:
+            daily_profit = daily['Profit']
+            if len(daily_profit) < 2:
+                return {"profit_chart": self._empty_chart("Profit Trend Chart", "Data covers fewer than two days")}
+            scatter = _scatter_type(len(daily_profit))
+            
+            # Profit line
+            traces = [scatter(
+                x=daily_profit.index,
+                y=daily_profit.values,
+                mode='lines+markers',
+                name='Daily Profit',
+                line=dict(color='blue', width=2)
+            )]
+            
+            # Add moving average if requested
+            if "moving" in keywords or "average" in keywords:
+                ma_7 = rolling_mean(daily_profit.to_numpy())
+                traces.append(scatter(
+                    x=daily_profit.index,
+                    y=ma_7,
+                    mode='lines',
+                    name='7-Day Average',
+                    line=dict(color='orange', width=1, dash='dash')
+                ))
+            
+            layout = dict(
+                title=f"Profit Trend Chart - {daily_profit.index[0].date().isoformat()} to {daily_profit.index[-1].date().isoformat()}",
+                xaxis_title="Date",
+                yaxis_title="Profit ($)",
+                hovermode='x unified',
+                **CHART_LAYOUT
+            )
+        else:
+            # Simple bar chart if no date column
+            traces = [go.Bar(
+                x=list(range(len(df))),
+                y=df['Profit'],
+                name='Profit',
+                marker_color='blue'
+            )]
+            
+            layout = dict(
+                title="Profit Chart",
+                xaxis_title="Record",
+                yaxis_title="Profit ($)",
+                **CHART_LAYOUT
+            )
+        
+        # Built in one constructor call so plotly validates the figure once
+        fig = go.Figure(data=traces, layout=layout)
+        
+        return {"profit_chart": self._figure_payload(fig, "Profit Trend Chart")}
+    
+    def _create_quarterly_chart(self, df: pd.DataFrame, task: str) -> Dict[str, Any]:
+        """Create quarterly performance chart"""
+        if 'Profit' not in df.columns or 'Date' not in df.columns:
+            return {}
+        
+        # Group by the quarters present in the data; resample would also emit every empty quarter in between
+        quarterly_columns = [col for col in ('Profit', 'Gross Sales', 'Units Sold') if col in df.columns]
+        quarterly_data = df[quarterly_columns].groupby(df.index.to_period('Q')).sum().dropna()
+        
+        if len(quarterly_data) < 2:
+            return {"quarterly_chart": "Insufficient data for quarterly chart"}
+        
+        # Calculate quarterly profit changes
+        quarterly_profit_changes = quarterly_data['Profit'].pct_change().dropna() * 100
+        
+        changes = quarterly_profit_changes.to_numpy()
+        # Period formatting understands %q; Timestamp.strftime left it literal
+        labels = quarterly_profit_changes.index.strftime('%Y-Q%q')
+        
+        # Create bar chart
+        fig = go.Figure(
+            data=[go.Bar(
+                x=labels.tolist(),
+                y=changes,
+                name='Quarterly Profit Change (%)',
+                marker_color=np.where(changes > 0, 'green', 'red').tolist()
+            )],
+            layout=dict(
+                title="Quarterly Profit Changes",
+                xaxis_title="Quarter",
+                yaxis_title="Profit Change (%)",
+                **CHART_LAYOUT
+            )
+        )
+        
+        return {"quarterly_chart": self._figure_payload(fig, "Quarterly Profit Changes")}
+    
+    def _create_volume_chart(self, df: pd.DataFrame, task: str, daily: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Create units sold chart"""
+        if 'Units Sold' not in df.columns:
+            return {}
+        
+        # Profit and units sold traces
+        if daily is not None:
+            daily_profit = daily['Profit']
+            daily_units = daily['Units Sold']
+            if len(daily_units) < 2:
+                return {"units_chart": self._empty_chart("Profit and Units Sold Chart", "Data covers fewer than two days")}
+            profit_trace = _scatter_type(len(daily_profit))(
+                x=daily_profit.index,
+                y=daily_profit.values,
+                mode='lines',
+                name='Daily Profit',
+                line=dict(color='blue')
+            )
+            units_trace = go.Bar(
+                x=daily_units.index,
+                y=daily_units.values,
+                name='Daily Units Sold',
+                marker_color='lightblue'
+            )
+        else:
+            profit_trace = _scatter_type(len(df))(
+                x=list(range(len(df))),
+                y=df['Profit'],
+                mode='lines',
+                name='Profit',
+                line=dict(color='blue')
+            )
+            units_trace = go.Bar(
+                x=list(range(len(df))),
+                y=df['Units Sold'],
+                name='Units Sold',
+                marker_color='lightblue'
+            )
+        
+        # Create subplot with profit and units sold
+        fig = make_subplots(
+            rows=2, cols=1,
+            shared_xaxes=True,
+            vertical_spacing=0.1,
+            subplot_titles=('Profit', 'Units Sold'),
+            row_heights=[0.7, 0.3]
+        )
+        fig.add_traces([profit_trace, units_trace], rows=[1, 2], cols=[1, 1])
+        
+        fig.update_layout(
+            title="Profit and Units Sold Chart",
+            **CHART_LAYOUT,
+            height=600
+        )
+        
+        return {"units_chart": self._figure_payload(fig, "Profit and Units Sold Chart")}
+    
+    def _create_trend_chart(self, df: pd.DataFrame, analysis_results: Dict, task: str, daily: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Create trend analysis chart"""
+        if 'Profit' not in df.columns:
+            return {}
+        
+        if daily is not None:
+            daily_profit = daily['Profit']
+            if len(daily_profit) < 2:
+                return {"trend_chart": self._empty_chart("Profit Trend Analysis", "Data covers fewer than two days")}
+            scatter = _scatter_type(len(daily_profit))
+            
+            # Profit line
+            traces = [scatter(
+                x=daily_profit.index,
+                y=daily_profit.values,
+                mode='lines+markers',
+                name='Daily Profit',
+                line=dict(color='blue', width=2)
+            )]
+            
+            # Add trend line if we have moving averages
+            if analysis_results.get('avg_daily_profit'):
+                ma_7 = rolling_mean(daily_profit.to_numpy())
+                traces.append(scatter(
+                    x=daily_profit.index,
+                    y=ma_7,
+                    mode='lines',
+                    name='7-Day Average',
+                    line=dict(color='orange', dash='dash')
+                ))
+            
+            layout = dict(
+                title="Profit Trend Analysis",
+                xaxis_title="Date",
+                yaxis_title="Profit ($)",
+                **CHART_LAYOUT
+            )
+        else:
+            # Simple bar chart if no date column
+            traces = [go.Bar(
+                x=list(range(len(df))),
+                y=df['Profit'],
+                name='Profit',
+                marker_color='blue'
+            )]
+            
+            layout = dict(
+                title="Profit Trend Analysis",
+                xaxis_title="Record",
+                yaxis_title="Profit ($)",
+                **CHART_LAYOUT
+            )
+        
+        fig = go.Figure(data=traces, layout=layout)
+        
+        return {"trend_chart": self._figure_payload(fig, "Profit Trend Analysis")}